@@ -0,0 +1,169 @@
+import datetime
+import json
+import logging
+
+import redis
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.models import User
+from apps.common.redis_client import get_redis_client
+from apps.profiles.models import Profile
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TIMEOUT = 60 * 15
+
+# The password hash never leaves the database; it's loaded on access
+USER_CACHE_FIELDS = [
+    field for field in User._meta.concrete_fields if field.attname != "password"
+]
+# The whole profile row, so the profile views and saves see every field
+PROFILE_CACHE_FIELDS = Profile._meta.concrete_fields
+
+
+class RecordEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder cuts datetimes to milliseconds, and a rebuilt
+    # instance would save the truncated value back
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def user_version_key(user_id):
+    return f"auth:user:{user_id}:version"
+
+
+def bump_user_version(user_id):
+    try:
+        get_redis_client().incr(user_version_key(user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
+
+
+def invalidate_cached_user(user_id):
+    """
+    Bump the user's cache version so any cached record, including one
+    being written by a request that loaded the old row, is ignored. It is
+    bumped again once the transaction commits, so a request that read the
+    old row before the commit can't cache it under the new version.
+    """
+    bump_user_version(user_id)
+    transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps a compact user record and the profile row
+    in Redis, so authenticated requests don't query the user or profile.
+    The password hash is left out and loaded from the database on access.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares against the password hash, which isn't cached
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        client = get_redis_client()
+        try:
+            record, version = client.mget(
+                user_cache_key(user_id), user_version_key(user_id)
+            )
+        except redis.RedisError as e:
+            logger.warning(f"User cache unavailable: {e}")
+            return super().get_user(validated_token)
+
+        version = version or "0"
+        record = json.loads(record) if record else None
+
+        # Records cached before the full profile was stored are reloaded too
+        if record is None or record["version"] != version or "profile" not in record:
+            record = self.load_user_record(user_id, version)
+            try:
+                client.set(
+                    user_cache_key(user_id),
+                    json.dumps(record, cls=RecordEncoder),
+                    ex=USER_CACHE_TIMEOUT,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to cache user {user_id}: {e}")
+
+        user = self.build_user(record)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
+    def load_user_record(self, user_id, version):
+        try:
+            user = (
+                User.objects.select_related("profile")
+                .defer("password")
+                .get(**{api_settings.USER_ID_FIELD: user_id})
+            )
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        return {
+            "version": version,
+            "user": {
+                field.attname: getattr(user, field.attname)
+                for field in USER_CACHE_FIELDS
+            },
+            "profile": (
+                {
+                    # File fields are stored by name, the way the column holds them
+                    field.attname: field.get_prep_value(
+                        getattr(user.profile, field.attname)
+                    )
+                    for field in PROFILE_CACHE_FIELDS
+                }
+                if hasattr(user, "profile")
+                else None
+            ),
+        }
+
+    def build_user(self, record):
+        data = record["user"]
+        user = User.from_db(
+            "default",
+            [field.attname for field in USER_CACHE_FIELDS],
+            [field.to_python(data[field.attname]) for field in USER_CACHE_FIELDS],
+        )
+
+        if record["profile"]:
+            data = record["profile"]
+            profile = Profile.from_db(
+                "default",
+                [field.attname for field in PROFILE_CACHE_FIELDS],
+                [
+                    field.to_python(data[field.attname])
+                    for field in PROFILE_CACHE_FIELDS
+                ],
+            )
+            # Make request.user.profile (and profile.user) free of queries
+            User.profile.related.set_cached_value(user, profile)
+            Profile.user.field.set_cached_value(profile, user)
+
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    # Documents CachedJWTAuthentication as the same bearer scheme
+    target_class = "apps.accounts.authentication.CachedJWTAuthentication"
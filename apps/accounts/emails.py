@@ -1,16 +1,13 @@
-import random
 import threading
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-from .models import Otp
+from .otp import OtpPurpose, get_otp_store
 
 
-def generate_otp(user):
-    otp = random.randint(100000, 999999)
-    # Save the OTP to the Otp model
-    Otp.objects.create(user=user, otp=otp)
-    return otp
+def generate_otp(user, purpose):
+    # Replaces any previous OTP, raises OtpThrottled if requested too soon
+    return get_otp_store().create(user, purpose)
 
 
 class EmailThread(threading.Thread):
@@ -26,7 +23,7 @@ class SendEmail:
 
     @staticmethod
     def send_email(request, user):
-        otp = generate_otp(user)
+        otp = generate_otp(user, OtpPurpose.EMAIL_VERIFICATION)
         subject = "Verify your email"
         email = user.email
         context = {
@@ -54,7 +51,7 @@ class SendEmail:
 
     @staticmethod
     def send_password_reset_email(request, user):
-        otp = generate_otp(user)
+        otp = generate_otp(user, OtpPurpose.PASSWORD_RESET)
         subject = "Your Password Reset OTP"
         email = user.email
         context = {
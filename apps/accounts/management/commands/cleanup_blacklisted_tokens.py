@@ -1,20 +1,22 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.accounts.utils import purge_expired_tokens
 
 class Command(BaseCommand):
     help = "Deletes expired blacklisted tokens and outstanding tokens from the database."
 
-    def handle(self, *args, **kwargs):
-        # Delete expired outstanding tokens
-        outstanding_deleted_count = OutstandingToken.objects.filter(
-            expires_at__lt=timezone.now()
-        ).delete()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of outstanding tokens deleted per batch.",
+        )
 
-        # Delete expired blacklisted tokens
-        blacklisted_deleted_count, _ = BlacklistedToken.objects.filter(
-            token__expires_at__lt=timezone.now()
-        ).delete()
+    def handle(self, *args, **kwargs):
+        outstanding_deleted_count, blacklisted_deleted_count = purge_expired_tokens(
+            kwargs["chunk_size"]
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -0,0 +1,142 @@
+import hashlib
+import hmac
+import secrets
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from apps.accounts.models import Otp
+from apps.common.redis_client import get_redis_client
+
+# Counts the attempt before the OTP is compared, so parallel guesses each get
+# their own count and can't all slip under the limit. A missing key isn't
+# recreated by the increment.
+ATTEMPT_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 0 then
+    return nil
+end
+local attempts = redis.call("hincrby", KEYS[1], "attempts", 1)
+local otp = redis.call("hmget", KEYS[1], "hash", "expires_at")
+return {attempts, otp[1], otp[2]}
+"""
+
+
+class OtpStatus:
+    VALID = "valid"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    LOCKED = "locked"  # Too many wrong attempts, a new OTP must be requested
+
+
+class OtpPurpose:
+    EMAIL_VERIFICATION = "email_verification"
+    PASSWORD_RESET = "password_reset"
+
+
+class OtpThrottled(Exception):
+    def __init__(self, wait: int):
+        self.wait = wait
+        super().__init__(f"OTP requested too soon, retry in {wait} seconds.")
+
+
+def new_otp() -> int:
+    return secrets.randbelow(900000) + 100000
+
+
+class DatabaseOtpStore:
+    """
+    Keeps OTPs in the Otp table. Used as a fallback and by the test suite;
+    it has no attempt limit or resend throttling, and one OTP per user is
+    shared by every purpose.
+    """
+
+    def create(self, user, purpose) -> int:
+        otp = new_otp()
+        self.invalidate(user, purpose)
+        Otp.objects.create(user=user, otp=otp)
+        return otp
+
+    def verify(self, user, otp, purpose) -> str:
+        otp_record = Otp.objects.filter(user=user, otp=otp).first()
+        if otp_record is None:
+            return OtpStatus.INVALID
+        if not otp_record.is_valid:
+            return OtpStatus.EXPIRED
+        return OtpStatus.VALID
+
+    def invalidate(self, user, purpose):
+        Otp.objects.filter(user=user).delete()
+
+
+class RedisOtpStore:
+    """
+    Keeps a hash of the current OTP per user and purpose in Redis. The key
+    expires on its own, attempts are counted, and new OTPs can only be
+    requested once every OTP_RESEND_INTERVAL_SECONDS.
+    """
+
+    def _key(self, user, purpose):
+        return f"otp:{purpose}:{user.pk}"
+
+    def _resend_key(self, user, purpose):
+        return f"otp:resend:{purpose}:{user.pk}"
+
+    def _hash(self, otp):
+        return hmac.new(
+            settings.SECRET_KEY.encode(), str(otp).encode(), hashlib.sha256
+        ).hexdigest()
+
+    def create(self, user, purpose) -> int:
+        client = get_redis_client()
+        resend_key = self._resend_key(user, purpose)
+
+        if not client.set(
+            resend_key, 1, nx=True, ex=settings.OTP_RESEND_INTERVAL_SECONDS
+        ):
+            raise OtpThrottled(max(client.ttl(resend_key), 1))
+
+        otp = new_otp()
+        expire_seconds = settings.EMAIL_OTP_EXPIRE_MINUTES * 60
+        key = self._key(user, purpose)
+
+        pipeline = client.pipeline()
+        pipeline.delete(key)
+        pipeline.hset(
+            key,
+            mapping={
+                "hash": self._hash(otp),
+                "expires_at": time.time() + expire_seconds,
+                "attempts": 0,
+            },
+        )
+        # Kept past expiry so a late attempt is reported as expired, not invalid
+        pipeline.expire(key, expire_seconds * 2)
+        pipeline.execute()
+
+        return otp
+
+    def verify(self, user, otp, purpose) -> str:
+        result = get_redis_client().eval(
+            ATTEMPT_SCRIPT, 1, self._key(user, purpose)
+        )
+        if result is None:
+            return OtpStatus.INVALID
+
+        attempts, otp_hash, expires_at = result
+        if float(expires_at) <= time.time():
+            return OtpStatus.EXPIRED
+        if attempts > settings.OTP_MAX_ATTEMPTS:
+            return OtpStatus.LOCKED
+        if hmac.compare_digest(otp_hash, self._hash(otp)):
+            return OtpStatus.VALID
+        if attempts >= settings.OTP_MAX_ATTEMPTS:
+            return OtpStatus.LOCKED
+        return OtpStatus.INVALID
+
+    def invalidate(self, user, purpose):
+        get_redis_client().delete(self._key(user, purpose))
+
+
+def get_otp_store():
+    return import_string(settings.OTP_STORE)()
@@ -1,9 +1,8 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import BlacklistedToken, OutstandingToken
 
-from apps.accounts.utils import validate_password_strength
+from apps.accounts.utils import blacklist_user_tokens, validate_password_strength
 from apps.common.schema_examples import ACCESS_TOKEN, REFRESH_TOKEN
 from apps.common.serializers import SuccessResponseSerializer
 
@@ -87,8 +86,7 @@ class PasswordChangeSerializer(serializers.Serializer):
         user.save()
 
         # Blacklist all active refresh tokens for the user
-        for token in OutstandingToken.objects.filter(user=user):
-            BlacklistedToken.objects.get_or_create(token=token)
+        blacklist_user_tokens(user)
 
 
 class RequestPasswordResetOtpSerializer(serializers.Serializer):
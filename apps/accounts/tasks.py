@@ -3,6 +3,8 @@ from celery import shared_task
 import requests, logging, uuid
 
 from apps.accounts.models import User
+from apps.accounts.utils import purge_expired_tokens
+from apps.common.locks import single_instance
 from apps.profiles.models import Profile
 
 
@@ -45,3 +47,16 @@ def download_and_upload_avatar(url: str, user_id: str):
     except requests.RequestException as e:
         logger.error(f"Error downloading image: {e}")
         return f"Error: {str(e)}"
+
+
+@shared_task
+@single_instance()
+def purge_expired_tokens_task(chunk_size=1000):
+    """
+    Periodic task to delete expired outstanding and blacklisted tokens in chunks.
+    """
+    outstanding_count, blacklisted_count = purge_expired_tokens(chunk_size)
+    logger.info(
+        f"Deleted {outstanding_count} expired outstanding tokens and {blacklisted_count} blacklisted tokens"
+    )
+    return f"Deleted {outstanding_count} outstanding and {blacklisted_count} blacklisted tokens"
@@ -1,15 +1,33 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from unittest.mock import patch
 
 from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
-
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.authentication import (
+    CachedJWTAuthentication,
+    RecordEncoder,
+    user_cache_key,
+    user_version_key,
+)
 from apps.accounts.models import Otp
+from apps.accounts.utils import blacklist_user_tokens, purge_expired_tokens
+from apps.accounts.otp import OtpPurpose, OtpStatus, RedisOtpStore
 from apps.common.errors import ErrorCode
+from apps.common.redis_client import get_redis_client
 from apps.common.schema_examples import ERR_RESPONSE_STATUS, SUCCESS_RESPONSE_STATUS
-from apps.common.utils import TestUtil
+from apps.common.utils import QueryBudgetMixin, TestUtil
 
 valid_data = {
     "first_name": "Test",
@@ -29,6 +47,8 @@ VALIDATION_ERROR = "VALIDATION_ERROR"
 EXPIRED = "expired"
 
 
+# Tests create Otp rows directly, so they use the database OTP store
+@override_settings(OTP_STORE="apps.accounts.otp.DatabaseOtpStore")
 class TestAccounts(APITestCase):
     register_url = "/api/v1/auth/register/"
     login_url = "/api/v1/auth/token/"
@@ -580,6 +600,143 @@ class TestAccounts(APITestCase):
 
         self.assertEqual(response.status_code, 422)
 
+    def test_blacklist_and_purge_tokens(self):
+        user = self.verified_user
+        for _ in range(5):
+            RefreshToken.for_user(user)
+
+        # Test all tokens blacklisted with a single query
+        with self.assertNumQueries(1):
+            self.assertEqual(blacklist_user_tokens(user), 5)
+        self.assertEqual(
+            BlacklistedToken.objects.filter(token__user=user).count(), 5
+        )
+        self.assertEqual(blacklist_user_tokens(user), 0)
+
+        # Test expired tokens purged in chunks
+        OutstandingToken.objects.filter(user=user).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        RefreshToken.for_user(user)
+        self.assertEqual(purge_expired_tokens(chunk_size=2), (5, 5))
+        self.assertEqual(OutstandingToken.objects.filter(user=user).count(), 1)
+
+    def test_cached_jwt_authentication(self):
+        user = self.verified_user
+        access_token = RefreshToken.for_user(user).access_token
+        authentication = CachedJWTAuthentication()
+        authentication.get_user(access_token)
+
+        # Cached user and profile need no queries
+        with self.assertNumQueries(0):
+            cached_user = authentication.get_user(access_token)
+            self.assertEqual(cached_user.email, user.email)
+            self.assertEqual(cached_user.profile.id, user.profile.id)
+            self.assertEqual(cached_user.profile.created, user.profile.created)
+            self.assertFalse(cached_user.profile.avatar)
+        self.assertEqual(cached_user.profile.get_deferred_fields(), set())
+
+        # Cache invalidated when the profile is saved
+        cached_user.profile.avatar = "avatars/avatar.gif"
+        cached_user.profile.save()
+        cached_profile = authentication.get_user(access_token).profile
+        self.assertEqual(cached_profile.avatar.name, "avatars/avatar.gif")
+        self.assertGreater(cached_profile.last_updated, user.profile.last_updated)
+
+        # Cache invalidated when the user is saved
+        user.first_name = "Changed"
+        user.save()
+        self.assertEqual(authentication.get_user(access_token).first_name, "Changed")
+
+        # Inactive user rejected from the cache too
+        user.is_active = False
+        user.save()
+        with self.assertRaises(AuthenticationFailed):
+            authentication.get_user(access_token)
+
+    def test_cached_user_invalidated_on_commit(self):
+        user = self.verified_user
+        access_token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.assertEqual(self.client.get("/api/v1/profile/").status_code, 200)
+
+        client = get_redis_client()
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save()
+
+            # A request that read the row before the commit caches the old
+            # row under the version bumped by the save
+            version = client.get(user_version_key(user.pk))
+            record = CachedJWTAuthentication().load_user_record(user.pk, version)
+            record["user"]["is_active"] = True
+            client.set(user_cache_key(user.pk), json.dumps(record, cls=RecordEncoder))
+
+        # Test the version bumped on commit discards the stale record
+        self.assertEqual(self.client.get("/api/v1/profile/").status_code, 401)
+
+    @override_settings(OTP_STORE="apps.accounts.otp.RedisOtpStore")
+    @patch("apps.accounts.emails.EmailThread.start")
+    def test_redis_otp_store(self, mock_email_start):
+        store = RedisOtpStore()
+        user = self.new_user
+        purpose = OtpPurpose.EMAIL_VERIFICATION
+        otp = store.create(user, purpose)
+
+        # Only a hash of the OTP is stored
+        stored = get_redis_client().hgetall(f"otp:{purpose}:{user.pk}")
+        self.assertNotIn(str(otp), stored.values())
+
+        # A password reset OTP neither replaces nor throttles it
+        reset_otp = store.create(user, OtpPurpose.PASSWORD_RESET)
+        self.assertEqual(
+            store.verify(user, reset_otp, OtpPurpose.PASSWORD_RESET), OtpStatus.VALID
+        )
+        store.invalidate(user, OtpPurpose.PASSWORD_RESET)
+
+        # Resend is throttled
+        response = self.client.post(self.send_email_url, {"email": user.email})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["code"], ErrorCode.TOO_MANY_REQUESTS)
+
+        # Wrong attempts lock the OTP, even for the right code afterwards
+        wrong_otp = otp + 1 if otp < 999999 else otp - 1
+        for _ in range(settings.OTP_MAX_ATTEMPTS - 1):
+            self.assertEqual(store.verify(user, wrong_otp, purpose), OtpStatus.INVALID)
+        self.assertEqual(store.verify(user, wrong_otp, purpose), OtpStatus.LOCKED)
+        response = self.client.post(
+            self.verify_email_url, {"email": user.email, "otp": otp}
+        )
+        self.assertEqual(response.status_code, 429)
+
+        # Valid OTP verifies the email and is cleared
+        get_redis_client().delete(f"otp:resend:{purpose}:{user.pk}")
+        otp = store.create(user, purpose)
+        response = self.client.post(
+            self.verify_email_url, {"email": user.email, "otp": otp}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(store.verify(user, otp, purpose), OtpStatus.INVALID)
+
+    def test_redis_otp_parallel_attempts(self):
+        store = RedisOtpStore()
+        user = self.new_user
+        purpose = OtpPurpose.PASSWORD_RESET
+        otp = store.create(user, purpose)
+        wrong_otp = otp + 1 if otp < 999999 else otp - 1
+
+        # Parallel guesses each count, so only OTP_MAX_ATTEMPTS are compared
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            statuses = list(
+                executor.map(
+                    lambda _: store.verify(user, wrong_otp, purpose), range(20)
+                )
+            )
+        self.assertEqual(
+            statuses.count(OtpStatus.INVALID), settings.OTP_MAX_ATTEMPTS - 1
+        )
+        self.assertEqual(store.verify(user, otp, purpose), OtpStatus.LOCKED)
+
 
 class TestGoogleOAuth(APITestCase):
     def setUp(self):
@@ -603,5 +760,88 @@ class TestGoogleOAuth(APITestCase):
         self.assertIn("authorization_url", response.json()["data"])
 
 
+@override_settings(OTP_STORE="apps.accounts.otp.DatabaseOtpStore")
+@patch("apps.accounts.emails.EmailThread.start")
+class TestAccountsQueryBudgets(QueryBudgetMixin, APITestCase):
+    # The Google OAuth views are left out, they redirect to Google and back
+    url = "/api/v1/auth/"
+
+    def setUp(self):
+        self.new_user = TestUtil.new_user()
+        self.verified_user = TestUtil.verified_user()
+
+    def test_registration_budgets(self, mock_start):
+        self.assertQueryBudget(5, "post", f"{self.url}register/", valid_data)
+        self.assertQueryBudget(
+            3, "post", f"{self.url}verification/", {"email": self.new_user.email}
+        )
+        otp = Otp.objects.create(user=self.new_user, otp=111111)
+        response = self.assertQueryBudget(
+            4,
+            "post",
+            f"{self.url}verification/verify/",
+            {"email": self.new_user.email, "otp": otp.otp},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_session_budgets(self, mock_start):
+        credentials = {"email": self.verified_user.email, "password": "Verified2001#"}
+        response = self.assertQueryBudget(3, "post", f"{self.url}token/", credentials)
+        self.assertEqual(response.status_code, 200)
+
+        refresh = RefreshToken.for_user(self.verified_user)
+        response = self.assertQueryBudget(
+            5, "post", f"{self.url}token/refresh/", {"refresh": str(refresh)}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=self.verified_user)
+        refresh = RefreshToken.for_user(self.verified_user)
+        response = self.assertQueryBudget(
+            4, "post", f"{self.url}sessions/", {"refresh": str(refresh)}
+        )
+        self.assertEqual(response.status_code, 200)
+        for _ in range(3):
+            RefreshToken.for_user(self.verified_user)
+        response = self.assertQueryBudget(2, "post", f"{self.url}sessions/all/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_budgets(self, mock_start):
+        self.client.force_authenticate(user=self.verified_user)
+        password = "NewPassword123#"
+        response = self.assertQueryBudget(
+            2,
+            "post",
+            f"{self.url}passwords/change/",
+            {
+                "old_password": "Verified2001#",
+                "new_password": password,
+                "confirm_password": password,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=None)
+        email = self.verified_user.email
+        self.assertQueryBudget(
+            3, "post", f"{self.url}passwords/reset/", {"email": email}
+        )
+        otp = Otp.objects.create(user=self.verified_user, otp=123456)
+        self.assertQueryBudget(
+            3,
+            "post",
+            f"{self.url}passwords/reset/verify/",
+            {"email": email, "otp": otp.otp},
+        )
+        password = "Changed123#"
+        response = self.assertQueryBudget(
+            2,
+            "post",
+            f"{self.url}passwords/reset/complete/",
+            {"email": email, "new_password": password, "confirm_password": password},
+        )
+        self.assertEqual(response.status_code, 200)
+
+
 # python manage.py test apps.accounts.tests.TestAccounts.test_register
 # python manage.py test apps.accounts.tests.TestAccounts.test_register
@@ -2,12 +2,16 @@ from decouple import config
 
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import DateTimeField, Value
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
 
-from requests_oauthlib import OAuth2Session
-
-
-from apps.accounts.models import Otp
+from apps.accounts.otp import get_otp_store
 
 
 def validate_password_strength(value):
@@ -18,8 +22,62 @@ def validate_password_strength(value):
     return value
 
 
-def invalidate_previous_otps(user):
-    Otp.objects.filter(user=user).delete()
+def invalidate_previous_otps(user, purpose):
+    get_otp_store().invalidate(user, purpose)
+
+
+def blacklist_user_tokens(user):
+    """
+    Blacklist all unexpired refresh tokens of the user in a single
+    INSERT ... SELECT. Returns the number of tokens blacklisted by this call.
+    Access tokens already issued stay valid until they expire.
+    """
+    now = timezone.now()
+    tokens = (
+        OutstandingToken.objects.filter(
+            user=user, expires_at__gt=now, blacklistedtoken__isnull=True
+        )
+        .order_by()
+        .values_list("id", Value(now, output_field=DateTimeField()))
+    )
+    select_sql, params = tokens.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(BlacklistedToken._meta.db_table)} "
+            f"(token_id, blacklisted_at) {select_sql} "
+            # A concurrent logout may have blacklisted some already
+            "ON CONFLICT (token_id) DO NOTHING",
+            params,
+        )
+        return cursor.rowcount
+
+
+def purge_expired_tokens(chunk_size=1000):
+    """
+    Delete expired outstanding tokens and their blacklist entries in chunks,
+    so large tables aren't locked by one long DELETE.
+    Returns the number of outstanding and blacklisted tokens deleted.
+    """
+    now = timezone.now()
+    outstanding_count = 0
+    blacklisted_count = 0
+
+    while True:
+        token_ids = list(
+            OutstandingToken.objects.filter(expires_at__lt=now).values_list(
+                "id", flat=True
+            )[:chunk_size]
+        )
+        if not token_ids:
+            break
+
+        blacklisted_count += BlacklistedToken.objects.filter(
+            token_id__in=token_ids
+        ).delete()[0]
+        outstanding_count += OutstandingToken.objects.filter(id__in=token_ids).delete()[0]
+
+    return outstanding_count, blacklisted_count
 
 
 client_id = config("GOOGLE_CLIENT_ID")
@@ -34,6 +92,9 @@ scope = [
 
 
 def google_setup(redirect_uri: str):
+    # Only the Google login views need it, so it's imported on first use
+    from requests_oauthlib import OAuth2Session
+
     # handles the OAuth 2.0 flow
     google = OAuth2Session(
         client_id=client_id,
@@ -54,6 +115,8 @@ def google_setup(redirect_uri: str):
 
 
 def google_callback(redirect_uri: str, auth_uri: str, state: str):
+    from requests_oauthlib import OAuth2Session
+
     google = OAuth2Session(
         client_id=client_id, scope=scope, redirect_uri=redirect_uri, state=state
     )
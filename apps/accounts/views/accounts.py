@@ -1,22 +1,21 @@
 import logging
 
 from django.conf import settings
-from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import (
     TokenBlacklistView,
     TokenObtainPairView,
     TokenRefreshView,
 )
 
+from apps.accounts.authentication import invalidate_cached_user
 from apps.accounts.emails import SendEmail
-from apps.accounts.models import Otp, User
+from apps.accounts.models import User
+from apps.accounts.otp import OtpPurpose, OtpStatus, OtpThrottled, get_otp_store
 from apps.accounts.permissions import IsUnauthenticated
 from apps.accounts.schema_examples import (
     LOGIN_RESPONSE_EXAMPLE,
@@ -40,7 +39,7 @@ from apps.accounts.serializers import (
     SetNewPasswordSerializer,
     VerifyOtpSerializer,
 )
-from apps.accounts.utils import invalidate_previous_otps
+from apps.accounts.utils import blacklist_user_tokens, invalidate_previous_otps
 from apps.common.errors import ErrorCode
 from apps.common.responses import CustomResponse
 
@@ -50,6 +49,22 @@ logger = logging.getLogger(__name__)
 tags = ["Auth"]
 
 
+def otp_throttled_response(exc):
+    return CustomResponse.error(
+        message=f"Please wait {exc.wait} seconds before requesting a new OTP.",
+        err_code=ErrorCode.TOO_MANY_REQUESTS,
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+
+
+def otp_locked_response():
+    return CustomResponse.error(
+        message="Too many incorrect attempts, please request a new OTP.",
+        err_code=ErrorCode.TOO_MANY_REQUESTS,
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+
+
 class RegisterView(APIView):
     serializer_class = RegisterSerializer
     permission_classes = (IsUnauthenticated,)
@@ -175,11 +190,11 @@ class ResendVerificationEmailView(APIView):
                 status_code=status.HTTP_200_OK,
             )
 
-        # Invalidate/clear any previous OTPs
-        invalidate_previous_otps(user)
-
-        # Send OTP to user's email
-        SendEmail.send_email(request, user)
+        # Send OTP to user's email, replacing any previous OTP
+        try:
+            SendEmail.send_email(request, user)
+        except OtpThrottled as e:
+            return otp_throttled_response(e)
 
         return CustomResponse.success(
             message="OTP sent successfully.",
@@ -214,26 +229,28 @@ class VerifyEmailView(APIView):
             )
 
         # Check if the OTP is valid for this user
-        try:
-            otp_record = Otp.objects.get(user=user, otp=otp)
-        except Otp.DoesNotExist:
+        otp_status = get_otp_store().verify(user, otp, OtpPurpose.EMAIL_VERIFICATION)
+        if otp_status == OtpStatus.INVALID:
             return CustomResponse.error(
                 message="Invalid OTP provided.",
                 err_code=ErrorCode.VALIDATION_ERROR,
             )
 
         # Check if OTP is expired
-        if not otp_record.is_valid:
+        if otp_status == OtpStatus.EXPIRED:
             return CustomResponse.error(
                 message="OTP has expired, please request a new one.",
                 status_code=498,
                 err_code=ErrorCode.EXPIRED,
             )
 
+        if otp_status == OtpStatus.LOCKED:
+            return otp_locked_response()
+
         # Check if user is already verified
         if user.is_email_verified:
             # Clear the OTP
-            invalidate_previous_otps(user)
+            invalidate_previous_otps(user, OtpPurpose.EMAIL_VERIFICATION)
             return CustomResponse.success(
                 message="Email address already verified. No OTP sent.",
                 status_code=status.HTTP_200_OK,
@@ -243,7 +260,7 @@ class VerifyEmailView(APIView):
         user.save()
 
         # Clear OTP after verification
-        invalidate_previous_otps(user)
+        invalidate_previous_otps(user, OtpPurpose.EMAIL_VERIFICATION)
 
         SendEmail.welcome(request, user)
 
@@ -291,14 +308,11 @@ class LogoutAllView(APIView):
     )
     def post(self, request):
         try:
-            # Get all valid tokens for the user
-            tokens = OutstandingToken.objects.filter(
-                user=request.user, expires_at__gt=timezone.now(), blacklistedtoken=None
-            )
+            # Blacklist all valid tokens for the user
+            blacklist_user_tokens(request.user)
 
-            # Blacklist all tokens
-            for token in tokens:
-                RefreshToken(token.token).blacklist()
+            # Drop the cached user so the next request reloads it
+            invalidate_cached_user(request.user.id)
 
             return CustomResponse.success(
                 message="Successfully logged out from all devices.",
@@ -358,11 +372,11 @@ class PasswordResetRequestView(APIView):
                 err_code=ErrorCode.VALIDATION_ERROR,
             )
 
-        # Clear otps if another otp is requested
-        invalidate_previous_otps(user)
-
-        # Send OTP to user's email
-        SendEmail.send_password_reset_email(request, user)
+        # Send OTP to user's email, replacing any previous OTP
+        try:
+            SendEmail.send_password_reset_email(request, user)
+        except OtpThrottled as e:
+            return otp_throttled_response(e)
 
         return CustomResponse.success(
             message="OTP sent successfully.", status_code=status.HTTP_200_OK
@@ -396,24 +410,26 @@ class VerifyOtpView(APIView):
             )
 
         # Check if the OTP is valid for this user
-        try:
-            otp_record = Otp.objects.get(user=user, otp=otp)
-        except Otp.DoesNotExist:
+        otp_status = get_otp_store().verify(user, otp, OtpPurpose.PASSWORD_RESET)
+        if otp_status == OtpStatus.INVALID:
             return CustomResponse.error(
                 message="The OTP could not be found. Please enter a valid OTP or request a new one.",
                 err_code=ErrorCode.VALIDATION_ERROR,
             )
 
         # Check if OTP is expired
-        if not otp_record.is_valid:
+        if otp_status == OtpStatus.EXPIRED:
             return CustomResponse.error(
                 message="OTP has expired, please request a new one.",
                 status_code=498,
                 err_code=ErrorCode.EXPIRED,
             )
 
+        if otp_status == OtpStatus.LOCKED:
+            return otp_locked_response()
+
         # Clear OTP after verification
-        invalidate_previous_otps(user)
+        invalidate_previous_otps(user, OtpPurpose.PASSWORD_RESET)
 
         return CustomResponse.success(
             message="OTP verified, proceed to set a new password.",
@@ -488,7 +504,7 @@ class RefreshTokensView(TokenRefreshView):
         else:
             # Extract the new refresh token from the response
             refresh = serializer.validated_data["refresh"]
-            access = serializer.validated_data("access")
+            access = serializer.validated_data["access"]
 
             # Set the new refresh token as an HTTP-only cookie
             response = CustomResponse.success(
@@ -5,6 +5,7 @@ import logging
 import redis
 from django.conf import settings
 
+from apps.common.redis_client import get_redis_client
 from apps.shop.models import Product
 
 logger = logging.getLogger(__name__)
@@ -24,11 +25,8 @@ class Cart:
         #     decode_responses=True,  # Ensures data is stored as strings
         # )
         try:
-            self.redis_client = redis.from_url(
-                settings.REDIS_URL,
-                decode_responses=True,
-                max_connections=50,
-            )
+            # Shared pool, and commands show up in the redis_commands_total metric
+            self.redis_client = get_redis_client()
 
             # Test connection
             self.redis_client.ping()
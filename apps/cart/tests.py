@@ -5,7 +5,7 @@ import uuid
 from rest_framework.test import APITestCase
 
 
-from apps.common.utils import TestUtil
+from apps.common.utils import QueryBudgetMixin, TestUtil
 from apps.discount.models import Discount, ProductDiscount
 from apps.shop.models import Product
 from apps.shop.test_utils import TestShopUtil
@@ -165,4 +165,20 @@ class TestCart(APITestCase):
         self.assertEqual(response.status_code, 401)
 
 
+class TestCartQueryBudgets(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = TestUtil.verified_user()
+        self.product1, _, self.product3 = TestShopUtil.product(self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_cart_budgets(self):
+        url = "/api/v1/cart/"
+        for product in (self.product1, self.product3):
+            self.assertQueryBudget(
+                2, "post", f"{url}add/", {"product_id": str(product.id), "quantity": 1}
+            )
+        self.assertQueryBudget(1, "get", url)
+        self.assertQueryBudget(1, "delete", f"{url}remove/{self.product1.id}/")
+
+
 # python manage.py test apps.cart.tests.TestCart.test_cart_detail
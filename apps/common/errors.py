@@ -31,6 +31,7 @@ class ErrorCode:
     SERVER_ERROR = "server_error"
     SERVICE_UNAVAILABLE = "service_unavailable"
     OPERATION_FAILED = "operation_failed"
+    TOO_MANY_REQUESTS = "too_many_requests"
     
     # Time-based
     EXPIRED = "expired"
@@ -0,0 +1,95 @@
+from functools import lru_cache
+
+from cloudinary.utils import cloudinary_url
+from django.db import transaction
+
+# Enough for every product image in a few sizes; URLs are ~150 bytes each
+IMAGE_URL_CACHE_SIZE = 8192
+
+# Named sizes precomputed for every product, review and team member image.
+# "cropped" matches the original cropped_image_url so old clients are unaffected.
+IMAGE_VARIANTS = {
+    "cropped": {"width": 250, "height": 250, "crop": "fill", "gravity": "auto"},
+    "thumbnail": {
+        "width": 100,
+        "height": 100,
+        "crop": "fill",
+        "gravity": "auto",
+        "fetch_format": "auto",
+        "quality": "auto",
+    },
+    "small": {"width": 400, "crop": "limit", "fetch_format": "auto", "quality": "auto"},
+    "medium": {"width": 800, "crop": "limit", "fetch_format": "auto", "quality": "auto"},
+    "large": {"width": 1600, "crop": "limit", "fetch_format": "auto", "quality": "auto"},
+}
+
+
+@lru_cache(maxsize=IMAGE_URL_CACHE_SIZE)
+def _build_url(public_id, format, version, type, resource_type, transformation):
+    url, _ = cloudinary_url(
+        public_id,
+        format=format,
+        version=version,
+        type=type,
+        resource_type=resource_type,
+        **dict(transformation),
+    )
+    return url
+
+
+def build_image_url(resource, **transformation):
+    """
+    Return the delivery URL of a CloudinaryResource with the given
+    transformation (width, height, crop, ...). URLs only depend on the
+    arguments and the Cloudinary config, so they're memoized per process.
+    """
+    return _build_url(
+        resource.public_id,
+        resource.format,
+        resource.version,
+        resource.type,
+        resource.resource_type or "image",
+        tuple(sorted(transformation.items())),
+    )
+
+
+def clear_image_url_cache():
+    _build_url.cache_clear()
+
+
+def image_url_cache_info():
+    return _build_url.cache_info()
+
+
+def get_public_id(image):
+    """Return the public id of a CloudinaryField value, None if it has none."""
+    return getattr(image, "public_id", None) or None
+
+
+def build_image_variants(image):
+    """Return the URL of every IMAGE_VARIANTS size, {} if there is no image."""
+    if get_public_id(image) is None:
+        return {}
+    return {
+        name: build_image_url(image, **transformation)
+        for name, transformation in IMAGE_VARIANTS.items()
+    }
+
+
+def queue_image_variants(instance, field_name):
+    """
+    Generate the variants of instance.<field_name> in the background once the
+    transaction commits, if the image changed since the instance was loaded.
+    Models keep the loaded value in _loaded_<field_name> (see their from_db).
+    """
+    public_id = get_public_id(getattr(instance, field_name))
+    if public_id == getattr(instance, f"_loaded_{field_name}", None):
+        return
+
+    from apps.common.tasks import generate_image_variants
+
+    setattr(instance, f"_loaded_{field_name}", public_id)
+    model_label = instance._meta.label
+    transaction.on_commit(
+        lambda: generate_image_variants.delay(model_label, str(instance.pk), field_name)
+    )
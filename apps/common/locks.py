@@ -0,0 +1,135 @@
+import functools
+import logging
+import threading
+import uuid
+
+import redis
+
+from apps.common.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LOCK_STATS_KEY = "lock:stats"
+
+# Only the holder's token may extend or delete the lock
+RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def record_lock_event(name, event):
+    """Count lock events (acquired, contended, lost, error) per lock name."""
+    try:
+        get_redis_client().hincrby(LOCK_STATS_KEY, f"{name}:{event}", 1)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to record lock event {name}:{event}: {e}")
+
+
+def get_lock_stats():
+    """Return {lock_name: {event: count}} for every lock that recorded events."""
+    stats = {}
+    for field, count in get_redis_client().hgetall(LOCK_STATS_KEY).items():
+        name, event = field.rsplit(":", 1)
+        stats.setdefault(name, {})[event] = int(count)
+    return stats
+
+
+class LeaseLock:
+    """
+    A Redis lock that expires after `ttl` seconds unless renewed, so a crashed
+    holder can't keep it forever. While held, a background thread renews the
+    lease every ttl / 3 seconds.
+    """
+
+    def __init__(self, name, ttl=60):
+        self.name = name
+        self.key = f"lock:{name}"
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid.uuid4().hex
+        self.lost = False
+        self._client = get_redis_client()
+        self._stop = threading.Event()
+        self._renewer = None
+
+    def acquire(self):
+        acquired = bool(
+            self._client.set(self.key, self.token, nx=True, px=self.ttl_ms)
+        )
+        if acquired:
+            self._renewer = threading.Thread(target=self._renew_loop, daemon=True)
+            self._renewer.start()
+        return acquired
+
+    def renew(self):
+        return bool(
+            self._client.eval(RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms)
+        )
+
+    def release(self):
+        self._stop.set()
+        if self._renewer is not None:
+            self._renewer.join()
+        try:
+            self._client.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        except redis.RedisError as e:
+            # The lease expires on its own
+            logger.warning(f"Failed to release lock {self.name}: {e}")
+
+    def _renew_loop(self):
+        while not self._stop.wait(self.ttl_ms / 3000):
+            try:
+                renewed = self.renew()
+            except redis.RedisError as e:
+                logger.warning(f"Failed to renew lock {self.name}: {e}")
+                continue
+            if not renewed:
+                self.lost = True
+                record_lock_event(self.name, "lost")
+                logger.error(f"Lock {self.name} expired while the task was running")
+                return
+
+
+def single_instance(name=None, ttl=60):
+    """
+    Run the decorated task only if no other worker is running it.
+    A run that finds the lock taken is skipped, not queued.
+    Apply it below @shared_task so Celery still sees the task's own name.
+    """
+
+    def decorator(func):
+        lock_name = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            lock = LeaseLock(lock_name, ttl=ttl)
+            try:
+                acquired = lock.acquire()
+            except redis.RedisError as e:
+                # Without Redis we can't tell whether another run is active
+                record_lock_event(lock_name, "error")
+                logger.error(f"Skipping {lock_name}, lock unavailable: {e}")
+                return f"Skipped: lock unavailable for {lock_name}"
+
+            if not acquired:
+                record_lock_event(lock_name, "contended")
+                logger.info(f"Skipping {lock_name}, another run holds the lock")
+                return f"Skipped: {lock_name} is already running"
+
+            record_lock_event(lock_name, "acquired")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                lock.release()
+
+        return wrapper
+
+    return decorator
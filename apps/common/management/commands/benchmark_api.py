@@ -0,0 +1,459 @@
+import json
+import math
+import statistics
+import subprocess
+import time
+from contextlib import ExitStack, contextmanager
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from cloudinary import CloudinaryResource
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import get_runner
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+from apps.common.queries import QueryRecorder
+from apps.orders.models import Order, OrderItem
+from apps.profiles.models import Profile, ShippingAddress, ShippingFee
+from apps.shop.models import Category, Product, Review
+
+PRODUCT_KINDS = ["Shirt", "Dress", "Jacket", "Trousers", "Sneakers"]
+SEARCH_TERM = "jacket"
+CART_PRODUCTS = 5
+ITEMS_PER_ORDER = 3
+PASSWORD = "Benchmark2024#"
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def seed_dataset(products=1000, reviews_per_product=5, users=50, orders_per_user=10):
+    """
+    Bulk insert a synthetic catalog, customers and order history. Signals
+    don't run for bulk inserts, so profiles are created here. Images are
+    Cloudinary public ids, so nothing is uploaded.
+    """
+    categories = [Category.objects.create(name=kind) for kind in PRODUCT_KINDS]
+    kinds = [PRODUCT_KINDS[index % len(PRODUCT_KINDS)] for index in range(products)]
+    catalog = Product.objects.bulk_create(
+        Product(
+            name=f"{kinds[index]} {index}",
+            description=f"Benchmark {kinds[index].lower()}",
+            price=Decimal(1000 + index % 50 * 100),
+            in_stock=1_000_000,
+            category=categories[index % len(categories)],
+            image=CloudinaryResource(
+                public_id=f"products/benchmark-{index}",
+                format="jpg",
+                version="1",
+                type="upload",
+                resource_type="image",
+            ),
+        )
+        for index in range(products)
+    )
+
+    # Hashing once keeps seeding fast with a slow password hasher
+    password = User(email="hash@example.com")
+    password.set_password(PASSWORD)
+    customers = User.objects.bulk_create(
+        User(
+            first_name="Benchmark",
+            last_name=f"User {index}",
+            email=f"benchmark{index}@example.com",
+            password=password.password,
+            is_email_verified=True,
+        )
+        for index in range(users)
+    )
+    profiles = Profile.objects.bulk_create(Profile(user=user) for user in customers)
+
+    Review.objects.bulk_create(
+        Review(
+            product=product,
+            customer=profiles[(index + offset) % len(profiles)],
+            text="Benchmark review",
+            rating=(index + offset) % 5 + 1,
+        )
+        for index, product in enumerate(catalog)
+        for offset in range(reviews_per_product)
+    )
+
+    ShippingFee.objects.create(state="Lagos", fee=5000)
+    addresses = ShippingAddress.objects.bulk_create(
+        ShippingAddress(
+            user=profile,
+            phone_number="8000000000",
+            state="Lagos",
+            postal_code="100001",
+            city="Ikeja",
+            street_address="1 Benchmark Street",
+            shipping_fee=5000,
+            default=True,
+        )
+        for profile in profiles
+    )
+
+    orders = Order.objects.bulk_create(
+        Order(
+            customer=profile,
+            state="Lagos",
+            city="Ikeja",
+            street_address="1 Benchmark Street",
+            shipping_fee=5000,
+            phone_number="8000000000",
+            postal_code="100001",
+        )
+        for profile in profiles
+        for _ in range(orders_per_user)
+    )
+    items = []
+    for index, order in enumerate(orders):
+        for offset in range(ITEMS_PER_ORDER):
+            product = catalog[(index * ITEMS_PER_ORDER + offset) % len(catalog)]
+            item = OrderItem(
+                order=order, product=product, quantity=1, price=product.price
+            )
+            item.capture_product_snapshot()
+            items.append(item)
+            order.subtotal = (order.subtotal or 0) + item.get_cost()
+        order.total = order.subtotal + order.shipping_fee
+    OrderItem.objects.bulk_create(items)
+    Order.objects.bulk_update(orders, ["subtotal", "total"])
+
+    return {
+        "products": catalog,
+        "users": customers,
+        "addresses": addresses,
+        "orders": orders,
+    }
+
+
+def gateway_response(*args, **kwargs):
+    """Stands in for the payment gateways' initialize endpoints."""
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        "status": True,
+        "data": {"authorization_url": "http://localhost/checkout"},
+    }
+    return response
+
+
+@contextmanager
+def stub_external_services():
+    """
+    Keep the run offline and measure the server only: payment gateways answer
+    locally, Celery tasks aren't queued and throttling is off. The test
+    environment already swaps SMTP for the in-memory email backend.
+    """
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch("apps.payments.views.requests.post", side_effect=gateway_response)
+        )
+        stack.enter_context(patch("apps.orders.views.order_created.delay"))
+        stack.enter_context(
+            patch(
+                "apps.common.throttling.SlidingWindowThrottleMixin.allow_request",
+                return_value=True,
+            )
+        )
+        yield
+
+
+def authenticated_client(user):
+    token = RefreshToken.for_user(user).access_token
+    return Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def build_scenarios(dataset):
+    """
+    Return (name, client, method, request factory, setup) per hot path. The
+    request factory gets the iteration number so reads rotate over the
+    dataset; setup runs untimed before each request.
+    """
+    products = dataset["products"]
+    users = dataset["users"]
+    anonymous = Client(HTTP_HOST="localhost")
+    shopper, buyer, customer = (authenticated_client(user) for user in users[:3])
+
+    def product_detail(index):
+        product = products[index % len(products)]
+        return f"/api/v1/products/{product.pk}/{product.slug}/", None
+
+    def cart_add(index):
+        product = products[index % CART_PRODUCTS]
+        data = {"product_id": str(product.pk), "quantity": 1, "override": True}
+        return "/api/v1/cart/add/", data
+
+    def fill_cart(index):
+        for offset in range(ITEMS_PER_ORDER):
+            product = products[(index + offset) % len(products)]
+            buyer.post(
+                "/api/v1/cart/add/", {"product_id": str(product.pk), "quantity": 1}
+            )
+
+    checkout_data = {"shipping_id": str(dataset["addresses"][1].pk)}
+    customer_order = next(
+        order for order in dataset["orders"] if order.customer.user_id == users[2].pk
+    )
+    payment_data = {"order_id": str(customer_order.pk), "payment_method": "paystack"}
+    payment_url = "/api/v1/payments/paystack/initialize-transaction/"
+
+    return [
+        ("product_list", anonymous, "get", lambda i: ("/api/v1/products/", None), None),
+        (
+            "product_search",
+            anonymous,
+            "get",
+            lambda i: ("/api/v1/products/", {"search": SEARCH_TERM}),
+            None,
+        ),
+        ("product_detail", anonymous, "get", product_detail, None),
+        ("cart_add", shopper, "post", cart_add, None),
+        ("cart_get", shopper, "get", lambda i: ("/api/v1/cart/", None), None),
+        (
+            "checkout",
+            buyer,
+            "post",
+            lambda i: ("/api/v1/orders/create/", checkout_data),
+            fill_cart,
+        ),
+        (
+            "payment_initialize",
+            customer,
+            "post",
+            lambda i: (payment_url, payment_data),
+            None,
+        ),
+        (
+            "order_history",
+            customer,
+            "get",
+            lambda i: ("/api/v1/orders/history/", None),
+            None,
+        ),
+        (
+            "order_history_summary",
+            customer,
+            "get",
+            lambda i: ("/api/v1/orders/history/summary/", None),
+            None,
+        ),
+    ]
+
+
+def run_scenario(client, method, build_request, setup, requests, warmup):
+    latencies, query_counts = [], []
+    for index in range(warmup + requests):
+        if setup:
+            setup(index)
+        url, data = build_request(index)
+
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = getattr(client, method)(url, data)
+        elapsed = time.perf_counter() - start
+
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{method.upper()} {url} returned {response.status_code}: "
+                f"{response.content[:200]!r}"
+            )
+        if index >= warmup:
+            latencies.append(elapsed * 1000)
+            query_counts.append(len(recorder))
+
+    return {
+        "url": url,
+        "method": method.upper(),
+        "requests": requests,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+        "queries": statistics.median_low(query_counts),
+        "queries_max": max(query_counts),
+    }
+
+
+def run_scenarios(dataset, requests=100, warmup=5, only=None):
+    results = {}
+    for name, client, method, build_request, setup in build_scenarios(dataset):
+        if only and name not in only:
+            continue
+        results[name] = run_scenario(
+            client, method, build_request, setup, requests, warmup
+        )
+    return results
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare_reports(previous, current, max_regression):
+    """
+    Return (lines, regressions) describing how each scenario changed. A p95
+    more than max_regression percent slower, or any extra query, regresses.
+    """
+    lines, regressions = [], []
+    for name, result in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            lines.append(f"{name}: new")
+            continue
+
+        p50 = (result["p50_ms"] / before["p50_ms"] - 1) * 100
+        p95 = (result["p95_ms"] / before["p95_ms"] - 1) * 100
+        queries = result["queries"] - before["queries"]
+        lines.append(
+            f"{name}: p50 {p50:+.1f}%, p95 {p95:+.1f}%, queries {queries:+d}"
+        )
+        if queries > 0 or (max_regression is not None and p95 > max_regression):
+            regressions.append(name)
+    return lines, regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a synthetic dataset into a throwaway test database and measures "
+        "p50/p95 latency and queries of the hot API paths, with payment gateways, "
+        "email and Celery stubbed. Writes a JSON report to compare between commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--reviews-per-product", type=int, default=5)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--orders-per-user", type=int, default=10)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=100,
+            help="Measured requests per scenario.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Unmeasured requests per scenario, run first to fill caches.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Scenario to run, e.g. product_list. Can be repeated, "
+            "defaults to all.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Path of the JSON report.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Earlier JSON report to compare this run against.",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="With --compare, fail if a p95 is this many percent slower "
+            "or a scenario runs more queries.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database between runs; it is reseeded either way.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+        if options["users"] < 3 or options["products"] < CART_PRODUCTS:
+            raise CommandError(
+                f"At least 3 users and {CART_PRODUCTS} products are needed."
+            )
+
+        previous = None
+        if options["compare"]:
+            previous = json.loads(Path(options["compare"]).read_text())
+
+        # Same setup as `manage.py test`: a fresh database, in-memory email
+        # and empty caches, so nothing touches the development data
+        runner = get_runner(settings)(
+            verbosity=0, interactive=False, keepdb=options["keepdb"]
+        )
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            with stub_external_services():
+                dataset_options = {
+                    "products": options["products"],
+                    "reviews_per_product": options["reviews_per_product"],
+                    "users": options["users"],
+                    "orders_per_user": options["orders_per_user"],
+                }
+                start = time.perf_counter()
+                dataset = seed_dataset(**dataset_options)
+                self.stdout.write(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+                scenarios = run_scenarios(
+                    dataset,
+                    requests=options["requests"],
+                    warmup=options["warmup"],
+                    only=options["scenario"],
+                )
+        finally:
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+
+        report = {
+            "commit": git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "dataset": dataset_options,
+            "scenarios": scenarios,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2))
+
+        self.stdout.write(
+            f"{'scenario':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}"
+        )
+        for name, result in scenarios.items():
+            self.stdout.write(
+                f"{name:<24}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}{result['queries']:>9}"
+            )
+
+        if previous:
+            lines, regressions = compare_reports(
+                previous, report, options["max_regression"]
+            )
+            baseline = previous.get("commit") or options["compare"]
+            self.stdout.write(f"Compared with {baseline}:")
+            for line in lines:
+                self.stdout.write(f"  {line}")
+            if regressions:
+                raise CommandError(f"Regressed: {', '.join(regressions)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
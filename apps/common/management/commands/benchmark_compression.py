@@ -0,0 +1,83 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.common.middleware import SUPPORTED_ENCODINGS, compress
+
+DEFAULT_URLS = [
+    "/api/v1/products/",
+    "/api/v1/categories/",
+    "/api/v1/site-detail/",
+    "/api/schema/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetches API endpoints uncompressed and reports the bytes saved and the "
+        "CPU time per response for each encoding at the configured levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            action="append",
+            help="Endpoint to measure. Can be repeated, defaults to the catalog and schema.",
+        )
+        parser.add_argument(
+            "--level",
+            action="append",
+            metavar="ENCODING=LEVEL",
+            help="Override COMPRESSION_LEVELS for this run, e.g. br=6. Can be repeated.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of runs; the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        levels = dict(settings.COMPRESSION_LEVELS)
+        for override in options["level"] or []:
+            encoding, _, level = override.partition("=")
+            if encoding not in SUPPORTED_ENCODINGS or not level.isdigit():
+                raise CommandError(f"Invalid level {override!r}, expected e.g. br=6.")
+            levels[encoding] = int(level)
+
+        client = Client(HTTP_HOST="localhost")
+        for url in options["url"] or DEFAULT_URLS:
+            response = client.get(url, HTTP_ACCEPT_ENCODING="identity")
+            if response.status_code != 200:
+                self.stdout.write(
+                    self.style.WARNING(f"{url}: skipped, status {response.status_code}")
+                )
+                continue
+
+            if response.streaming:
+                body = b"".join(response.streaming_content)
+            else:
+                body = response.content
+            self.stdout.write(f"{url}: {len(body)} bytes")
+            for encoding in SUPPORTED_ENCODINGS:
+                level = levels[encoding]
+                compressed, elapsed = self.time_compression(
+                    body, encoding, level, options["repeat"]
+                )
+                saved = 1 - len(compressed) / len(body) if body else 0
+                self.stdout.write(
+                    f"  {encoding:<4} level {level:<2} {len(compressed):>8} bytes "
+                    f"({saved:.0%} saved) {elapsed * 1000:.2f} ms"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def time_compression(self, body, encoding, level, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compressed = compress(body, encoding, level)
+            timings.append(time.perf_counter() - start)
+        return compressed, min(timings)
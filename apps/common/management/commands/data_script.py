@@ -10,6 +10,7 @@ from django.db import transaction
 
 from apps.accounts.models import User
 from apps.common.management.commands.data import TEAM_MEMBERS_DATA
+from apps.general.cache import clear_general_content_cache
 from apps.general.models import TEAM_MEMBER_FOLDER, Message, Social, TeamMember
 from apps.orders.models.order import Order
 from apps.shop.models import Category, Product
@@ -193,6 +194,8 @@ class CreateData:
         if team_members_to_create:
             try:
                 team_members = TeamMember.objects.bulk_create(team_members_to_create)
+                # bulk_create doesn't send post_save, so clear the cached team list
+                clear_general_content_cache()
                 logger.info(
                     f"Successfully created {created_count} team members, skipped {skipped_count}."
                 )
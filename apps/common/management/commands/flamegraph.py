@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.profiling import (
+    PROFILE_EXTENSION,
+    load_profiles,
+    profile_dir,
+    render_flamegraph,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregates the request profiles saved by ProfilerMiddleware into one "
+        "flame graph (SVG) and collapsed stack file per URL name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--view",
+            action="append",
+            help="URL name to aggregate, e.g. apps.shop.views.ProductListGenericView. "
+            "Can be repeated, defaults to every profiled view.",
+        )
+        parser.add_argument(
+            "--output-dir",
+            help="Where to write the flame graphs, defaults to PROFILER_DIR/flamegraphs.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the request profiles once they have been aggregated.",
+        )
+
+    def handle(self, *args, **options):
+        root = Path(settings.PROFILER_DIR)
+        output_dir = Path(options["output_dir"] or root / "flamegraphs")
+
+        if options["view"]:
+            directories = [profile_dir(view) for view in options["view"]]
+        else:
+            directories = sorted(
+                path
+                for path in root.glob("*")
+                if path.is_dir() and path != output_dir
+            )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for directory in directories:
+            paths = sorted(directory.glob(f"*{PROFILE_EXTENSION}"))
+            if not paths:
+                self.stdout.write(self.style.WARNING(f"{directory.name}: no profiles"))
+                continue
+
+            stacks = load_profiles(paths)
+            title = f"{directory.name}, {len(paths)} requests"
+            (output_dir / f"{directory.name}.svg").write_text(
+                render_flamegraph(stacks, title)
+            )
+            (output_dir / f"{directory.name}{PROFILE_EXTENSION}").write_text(
+                "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+            )
+            self.stdout.write(
+                f"{directory.name}: {len(paths)} requests, "
+                f"{sum(stacks.values())} samples"
+            )
+            written += 1
+
+            if options["clear"]:
+                for path in paths:
+                    path.unlink()
+
+        if not written:
+            raise CommandError(f"No profiles found in {root}.")
+        self.stdout.write(self.style.SUCCESS(f"Flame graphs written to {output_dir}."))
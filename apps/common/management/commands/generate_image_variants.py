@@ -0,0 +1,47 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.common.tasks import VARIANTS_FIELDS, generate_image_variants
+
+# Models with precomputed image variants and their image field
+IMAGE_MODELS = {
+    "shop.Product": "image",
+    "shop.Review": "image",
+    "general.TeamMember": "avatar",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the image variant URLs of products, reviews and team members. "
+        "Only rows without variants are processed unless --all is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=IMAGE_MODELS.keys(),
+            help="Only process this model. Can be repeated.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate variants for every row, e.g. after IMAGE_VARIANTS changes.",
+        )
+
+    def handle(self, *args, **options):
+        for model_label in options["model"] or IMAGE_MODELS:
+            field_name = IMAGE_MODELS[model_label]
+            queryset = apps.get_model(model_label).objects.all()
+            if not options["all"]:
+                queryset = queryset.filter(**{VARIANTS_FIELDS[field_name]: {}})
+
+            count = 0
+            for pk in queryset.values_list("pk", flat=True).iterator():
+                generate_image_variants(model_label, str(pk), field_name)
+                count += 1
+
+            self.stdout.write(
+                self.style.SUCCESS(f"Generated variants for {count} {model_label} rows.")
+            )
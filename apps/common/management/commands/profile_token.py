@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.common.profiling import PROFILE_HEADER, make_profile_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints a signed X-Profile header value. Requests sending it are "
+        "profiled by ProfilerMiddleware until the token expires."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{PROFILE_HEADER}: {make_profile_token()}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Valid for {settings.PROFILER_TOKEN_MAX_AGE // 60} minutes."
+            )
+        )
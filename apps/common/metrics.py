@@ -0,0 +1,99 @@
+import os
+
+import redis
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily
+
+# Under gunicorn and Celery prefork every process writes its samples to
+# PROMETHEUS_MULTIPROC_DIR and the /metrics view adds them up at scrape time
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by resolved view, method and status.",
+    ["view", "method", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per request.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per request.",
+    ["view"],
+)
+REDIS_COMMANDS = Counter(
+    "redis_commands_total",
+    "Redis commands sent through the shared clients, pipelined ones included.",
+    ["command"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time by task and final state.",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float("inf")),
+)
+CELERY_TASK_FAILURES = Counter(
+    "celery_task_failures_total",
+    "Celery tasks that raised.",
+    ["task"],
+)
+
+
+class LockStatsCollector:
+    """
+    Exports the lease lock counters (see apps.common.locks) kept in Redis.
+    They're shared by every worker already, so they're read at scrape time.
+    """
+
+    def metric_family(self):
+        return CounterMetricFamily(
+            "task_lock_events",
+            "Lease lock events by lock and event.",
+            labels=["lock", "event"],
+        )
+
+    def describe(self):
+        # Lets the registry check names without reading Redis
+        yield self.metric_family()
+
+    def collect(self):
+        # Imported here, locks goes through the instrumented client defined on metrics
+        from apps.common.locks import get_lock_stats
+
+        metric = self.metric_family()
+        try:
+            stats = get_lock_stats()
+        except redis.RedisError:
+            stats = {}
+        for name, events in stats.items():
+            for event, count in events.items():
+                metric.add_metric([name, event], count)
+        yield metric
+
+
+if not MULTIPROCESS:
+    REGISTRY.register(LockStatsCollector())
+
+
+def get_registry():
+    """Return the registry to scrape, merging every process in multiprocess mode."""
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(LockStatsCollector())
+    return registry
+
+
+def render_metrics():
+    return generate_latest(get_registry())
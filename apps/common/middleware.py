@@ -0,0 +1,268 @@
+import gzip
+import logging
+import random
+import sys
+import time
+import zlib
+
+import brotli
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.common.metrics import REQUEST_DB_QUERIES, REQUEST_DB_TIME, REQUEST_LATENCY
+from apps.common.profiling import (
+    PROFILE_HEADER,
+    Sampler,
+    is_valid_profile_token,
+    save_profile,
+)
+from apps.common.queries import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing; images and precompressed static files aren't
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/vnd.oai.openapi",
+    "application/javascript",
+    "text/",
+)
+
+# In order of preference when the client accepts both equally
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """Pick the preferred supported encoding the client accepts, or None."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, level):
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def get_compressor(encoding, level):
+    """Return (process, finish) callables for compressing a stream."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.finish
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def compress_sequence(sequence, encoding, level):
+    process, finish = get_compressor(encoding, level)
+    for chunk in sequence:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_sequence(sequence, encoding, level):
+    process, finish = get_compressor(encoding, level)
+    async for chunk in sequence:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress text and JSON responses with Brotli or gzip, whichever the client
+    prefers. Responses under COMPRESSION_MIN_SIZE are sent as they are, since
+    the saving doesn't cover the CPU; streaming responses are compressed chunk
+    by chunk. Levels are set per encoding in COMPRESSION_LEVELS.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+
+        content_type = response.get("Content-Type", "")
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+
+        if response.streaming:
+            length = response.get("Content-Length")
+            if length and int(length) < settings.COMPRESSION_MIN_SIZE:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+        level = settings.COMPRESSION_LEVELS[encoding]
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(
+                    response.streaming_content, encoding, level
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, encoding, level
+                )
+            # The compressed size isn't known until the stream ends
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = compress(response.content, encoding, level)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # A strong ETag must change with the encoding, weaken it as GZipMiddleware does
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+
+        return response
+
+
+# Anything else is recorded as "other" to keep the label set bounded
+METRIC_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class QueryMetrics:
+    """connection.execute_wrapper that counts and times the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Record request latency by resolved view name, method and status, along
+    with the number of database queries and the time spent in them.
+    Unmatched URLs share one label so scanners can't inflate the series.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryMetrics()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        method = request.method if request.method in METRIC_METHODS else "other"
+
+        REQUEST_LATENCY.labels(view, method, response.status_code).observe(duration)
+        REQUEST_DB_QUERIES.labels(view).observe(queries.count)
+        REQUEST_DB_TIME.labels(view).observe(queries.duration)
+        return response
+
+
+class NPlusOneMiddleware:
+    """
+    Development aid: fingerprints the SQL of each request and logs a warning
+    when the same query shape runs N_PLUS_ONE_THRESHOLD times or more, which
+    is usually a relation read in a loop without select/prefetch_related.
+    The query count is returned in the X-Query-Count header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        for shape, count in recorder.repeated(settings.N_PLUS_ONE_THRESHOLD):
+            match = request.resolver_match
+            view = match.view_name if match else request.path
+            logger.warning(f"Possible N+1 in {view}: {count} x {shape}")
+
+        response["X-Query-Count"] = str(len(recorder))
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Sample the stack of requests carrying a valid signed X-Profile header,
+    and of PROFILER_SAMPLE_RATE of all other requests, then save the stacks
+    under PROFILER_DIR by view name for the flamegraph command.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def should_profile(self, request):
+        token = request.headers.get(PROFILE_HEADER)
+        if token:
+            return is_valid_profile_token(token)
+        return random.random() < settings.PROFILER_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        # Stacks start at this frame, the server's frames above it are the same
+        sampler = Sampler(settings.PROFILER_INTERVAL, root=sys._getframe())
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        if sampler.stacks:
+            try:
+                path = save_profile(sampler, view)
+            except OSError as e:
+                logger.warning(f"Failed to save profile for {view}: {e}")
+            else:
+                response["X-Profile-Id"] = path.stem
+        return response
@@ -0,0 +1,62 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified to GET responses, computed from one aggregate
+    query (latest update timestamp and row count) over the view's validator
+    queryset. A client holding the current version gets a 304 before the
+    full query runs and before anything is serialized.
+
+    Views set `last_modified_fields` to the timestamps that change whenever
+    the response does, and may override `get_validator_queryset()`.
+    """
+
+    last_modified_fields = ["last_updated"]
+
+    def get_validator_queryset(self):
+        return self.get_queryset()
+
+    def get_validators(self):
+        """
+        Return (etag, last_modified), or (None, None) if there are no rows,
+        so the view can answer with its usual 404 or empty response.
+        """
+        aggregates = {
+            f"max_{index}": Max(field)
+            for index, field in enumerate(self.last_modified_fields)
+        }
+        result = (
+            self.get_validator_queryset()
+            .order_by()
+            .aggregate(count=Count("pk", distinct=True), **aggregates)
+        )
+
+        timestamps = [result[key] for key in aggregates if result[key] is not None]
+        if not result["count"] or not timestamps:
+            return None, None
+
+        last_modified = max(timestamps)
+        version = f"{result['count']}:{last_modified.isoformat()}"
+        etag = f'"{hashlib.md5(version.encode()).hexdigest()}"'
+        return etag, int(last_modified.timestamp())
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
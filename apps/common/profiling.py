@@ -0,0 +1,187 @@
+import os
+import re
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from html import escape
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_SALT = "apps.common.profiling"
+PROFILE_EXTENSION = ".folded"
+
+# Keeps view names like "admin:index" usable as directory names
+UNSAFE_PATH_CHARS = re.compile(r"[^\w.-]")
+
+STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+
+
+def make_profile_token():
+    """Signed value for the X-Profile header, valid for PROFILER_TOKEN_MAX_AGE."""
+    return signing.dumps("profile", salt=PROFILE_SALT)
+
+
+def is_valid_profile_token(token):
+    try:
+        signing.loads(
+            token, salt=PROFILE_SALT, max_age=settings.PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def frame_label(code):
+    filename = code.co_filename
+    if "site-packages" in filename:
+        filename = filename.rsplit("site-packages", 1)[1].lstrip(os.sep)
+    elif filename.startswith(str(settings.BASE_DIR)):
+        filename = os.path.relpath(filename, settings.BASE_DIR)
+    elif filename.startswith(STDLIB_DIR):
+        filename = os.path.relpath(filename, STDLIB_DIR)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def collapse(frame, root=None):
+    """Return the stack from root (or the thread's entry) to frame, ';' separated."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        if frame is root:
+            break
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """
+    Statistical profiler for the calling thread. A background thread records
+    the thread's stack every `interval` seconds, so the cost doesn't grow
+    with the number of function calls the way cProfile's does.
+    """
+
+    def __init__(self, interval, root=None):
+        self.interval = interval
+        self.root = root
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame, self.root)] += 1
+
+    def collapsed(self):
+        """Stacks in the collapsed format read by flame graph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def profile_dir(view_name):
+    return Path(settings.PROFILER_DIR) / UNSAFE_PATH_CHARS.sub("_", view_name)
+
+
+def save_profile(sampler, view_name):
+    """Write one request's stacks under PROFILER_DIR/<view name>/ and return the path."""
+    directory = profile_dir(view_name)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{time.time_ns()}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSION}"
+    path.write_text(sampler.collapsed())
+    prune_profiles(directory, settings.PROFILER_MAX_FILES)
+    return path
+
+
+def prune_profiles(directory, max_files):
+    """Delete the oldest profiles in directory beyond the newest max_files."""
+    # Names start with the save time in nanoseconds, so they sort newest first
+    paths = sorted(directory.glob(f"*{PROFILE_EXTENSION}"), reverse=True)
+    for path in paths[max_files:]:
+        # A concurrent request may have pruned it already
+        path.unlink(missing_ok=True)
+
+
+def load_profiles(paths):
+    """Sum the sample counts of collapsed stack files."""
+    stacks = Counter()
+    for path in paths:
+        for line in Path(path).read_text().splitlines():
+            stack, _, count = line.rpartition(" ")
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+FRAME_HEIGHT = 16
+GRAPH_WIDTH = 1200
+MIN_FRAME_WIDTH = 0.1  # Narrower frames are left out to keep the file small
+
+
+def build_tree(stacks):
+    tree = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        tree["count"] += count
+        node = tree
+        for label in stack.split(";"):
+            node = node["children"].setdefault(label, {"count": 0, "children": {}})
+            node["count"] += count
+    return tree
+
+
+def render_flamegraph(stacks, title):
+    """Render collapsed stacks as a flame graph SVG, widest (slowest) frames first."""
+    tree = build_tree(stacks)
+    total = tree["count"] or 1
+    scale = GRAPH_WIDTH / total
+    rects = []
+    depth_reached = 0
+
+    def walk(node, x, depth):
+        nonlocal depth_reached
+        for label, child in sorted(
+            node["children"].items(), key=lambda item: -item[1]["count"]
+        ):
+            width = child["count"] * scale
+            if width >= MIN_FRAME_WIDTH:
+                depth_reached = max(depth_reached, depth)
+                rects.append((x, depth, width, label, child["count"]))
+                walk(child, x, depth + 1)
+            x += width
+
+    walk(tree, 0, 0)
+
+    height = (depth_reached + 3) * FRAME_HEIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{GRAPH_WIDTH}" '
+        f'height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="12">{escape(title)} ({tree["count"]} samples)</text>',
+    ]
+    for x, depth, width, label, count in rects:
+        # Root at the bottom, callees stacked above their callers
+        y = height - (depth + 1) * FRAME_HEIGHT
+        hue = 20 + zlib.crc32(label.encode()) % 40
+        percent = count * 100 / total
+        text = escape(label[: int(width / 7)]) if width > 21 else ""
+        parts.append(
+            f'<g><title>{escape(label)}: {count} samples ({percent:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FRAME_HEIGHT - 1}" '
+            f'fill="hsl({hue}, 90%, 60%)"/>'
+            f'<text x="{x + 2:.1f}" y="{y + 11}">{text}</text></g>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
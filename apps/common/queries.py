@@ -0,0 +1,56 @@
+import re
+import time
+from collections import Counter
+
+# Transaction control repeats naturally and isn't an N+1
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)", re.IGNORECASE)
+NUMBER = re.compile(r"\b\d+\b")
+STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(sql):
+    """
+    Reduce a query to its shape: parameters are already placeholders, so only
+    IN lists of any length and inlined literals need collapsing.
+    """
+    sql = IN_LIST.sub("IN (...)", sql)
+    sql = STRING.sub("?", sql)
+    return NUMBER.sub("?", sql)
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper that keeps the SQL of every query it sees,
+    so repeated queries of the same shape (usually an N+1) can be reported.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            if not sql.lstrip().upper().startswith(IGNORED_PREFIXES):
+                self.queries.append(sql)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated(self, threshold):
+        """Return [(fingerprint, count)] for shapes run at least threshold times."""
+        counts = Counter(fingerprint(sql) for sql in self.queries)
+        return [(shape, count) for shape, count in counts.items() if count >= threshold]
+
+    def report(self, threshold=None):
+        lines = [f"{len(self)} queries:"]
+        lines += [f"  {index}. {sql}" for index, sql in enumerate(self.queries, 1)]
+        if threshold is not None:
+            for shape, count in self.repeated(threshold):
+                lines.append(f"Repeated {count} times: {shape}")
+        return "\n".join(lines)
@@ -0,0 +1,53 @@
+import redis
+from django.conf import settings
+from redis.client import Pipeline
+
+from apps.common.metrics import REDIS_COMMANDS
+
+_redis_clients = {}
+
+
+class InstrumentedPipeline(Pipeline):
+    def execute(self, raise_on_error=True):
+        for args, _ in self.command_stack:
+            REDIS_COMMANDS.labels(command=str(args[0]).upper()).inc()
+        return super().execute(raise_on_error)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that counts the commands it sends by name."""
+
+    def execute_command(self, *args, **options):
+        REDIS_COMMANDS.labels(command=str(args[0]).upper()).inc()
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def _get_client(url):
+    if url not in _redis_clients:
+        _redis_clients[url] = InstrumentedRedis.from_url(
+            url,
+            decode_responses=True,
+            max_connections=50,
+        )
+    return _redis_clients[url]
+
+
+def get_redis_client():
+    """
+    Return a Redis client shared by the process.
+    The connection pool is created on first use.
+    """
+    return _get_client(settings.REDIS_URL)
+
+
+def get_cache_redis_client():
+    """
+    Return a client for the cache database (settings.CACHE_URL), used for
+    throttling history and other disposable data kept apart from the cart.
+    """
+    return _get_client(settings.CACHE_URL)
@@ -0,0 +1,45 @@
+import time
+
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+)
+from prometheus_client import multiprocess
+
+from apps.common.metrics import (
+    CELERY_TASK_DURATION,
+    CELERY_TASK_FAILURES,
+    MULTIPROCESS,
+)
+
+# Start times by task id; the threads pool runs several tasks per process
+_task_started = {}
+
+
+@task_prerun.connect
+def record_task_start(task_id, task, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id, task, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+@task_failure.connect
+def record_task_failure(sender=None, **kwargs):
+    CELERY_TASK_FAILURES.labels(sender.name).inc()
+
+
+@worker_process_shutdown.connect
+def drop_process_metrics(pid=None, **kwargs):
+    # Like child_exit in gunicorn.conf.py: an exited prefork child's live
+    # gauge samples would otherwise keep being summed at scrape time
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
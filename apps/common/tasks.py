@@ -0,0 +1,37 @@
+import logging
+
+from celery import shared_task
+from django.apps import apps
+
+from apps.common.images import build_image_variants
+
+logger = logging.getLogger(__name__)
+
+# The JSON column each image field's variants are stored in
+VARIANTS_FIELDS = {"image": "image_variants", "avatar": "avatar_variants"}
+
+
+@shared_task
+def generate_image_variants(model_label, pk, field_name):
+    """
+    Precompute the variant URLs of an image and store them on the instance,
+    so serializers read them instead of building URLs per request.
+    """
+    model = apps.get_model(model_label)
+    variants_field = VARIANTS_FIELDS[field_name]
+
+    try:
+        instance = model.objects.get(pk=pk)
+    except model.DoesNotExist:
+        logger.error(f"{model_label} with id {pk} not found")
+        return f"Error: {model_label} with id {pk} not found"
+
+    setattr(instance, variants_field, build_image_variants(getattr(instance, field_name)))
+
+    # save() so post_save receivers (cache invalidation, ETags) see the change
+    update_fields = [variants_field]
+    if any(field.name == "last_updated" for field in model._meta.fields):
+        update_fields.append("last_updated")
+    instance.save(update_fields=update_fields)
+
+    return f"Generated {len(getattr(instance, variants_field))} variants for {model_label} {pk}"
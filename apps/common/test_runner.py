@@ -0,0 +1,14 @@
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+
+
+class CacheClearingTestRunner(DiscoverRunner):
+    """
+    Start every run with empty caches. Throttle history and sessions live in
+    Redis now and would otherwise carry over from the previous run.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        for cache in caches.all(initialized_only=False):
+            cache.clear()
@@ -1,3 +1,495 @@
-from django.test import TestCase
+import gzip
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from importlib import import_module
+from unittest.mock import patch
 
-# Create your tests here.
+import brotli
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+from django.utils.translation import gettext_lazy as _
+from prometheus_client import REGISTRY
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.locks import LeaseLock, get_lock_stats, single_instance
+from apps.common.management.commands.benchmark_api import (
+    compare_reports,
+    run_scenarios,
+    seed_dataset,
+    stub_external_services,
+)
+from apps.common.middleware import (
+    CompressionMiddleware,
+    ProfilerMiddleware,
+    choose_encoding,
+)
+from apps.common.parsers import ORJSONParser
+from apps.common.profiling import make_profile_token
+from apps.common.redis_client import get_cache_redis_client, get_redis_client
+from apps.common.renderers import ORJSONRenderer
+from apps.common.throttling import SlidingWindowAnonRateThrottle
+from clothing_store.celery import app
+
+# Boots Django the way a web worker does before and after its first request,
+# then lists the modules it loaded
+BOOT_SCRIPT = (
+    "import sys, django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "print(*sys.modules)"
+)
+
+# Heavy optional dependencies that must only load on first use
+LAZY_MODULES = ["weasyprint", "requests_oauthlib"]
+
+PROJECT_PACKAGES = ("apps", "clothing_store")
+
+# Time spent in the project's own module bodies at boot, about 35 ms on a dev
+# machine. The default leaves room for slow CI runners; raise it deliberately
+IMPORT_TIME_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", 250))
+
+
+def parse_importtime(output):
+    """Parse `python -X importtime` output into {module: self_us}."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+class TestBootImports(SimpleTestCase):
+    def test_boot_imports(self):
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(settings.BASE_DIR), env.get("PYTHONPATH")])
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        # Heavy modules stay out of the boot path
+        modules = set(result.stdout.split())
+        self.assertIn("django", modules)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules, f"{module} is imported at startup")
+
+        # Project modules don't do heavy work at import time
+        project_times = {
+            module: self_us
+            for module, self_us in parse_importtime(result.stderr).items()
+            if module.split(".")[0] in PROJECT_PACKAGES
+        }
+        self.assertTrue(project_times, result.stderr[-2000:])
+        total_ms = sum(project_times.values()) / 1000
+        slowest = sorted(project_times.items(), key=lambda item: -item[1])[:10]
+        self.assertLess(
+            total_ms,
+            IMPORT_TIME_BUDGET_MS,
+            f"Project modules took {total_ms:.0f} ms to import, slowest: {slowest}",
+        )
+
+
+class TestCeleryRouting(SimpleTestCase):
+    """Publishes tasks to an in-memory broker and checks the queue they land on."""
+
+    def published_queue(self, conn, task_name, queues):
+        app.send_task(task_name, connection=conn)
+        for queue in queues:
+            with conn.SimpleQueue(queue) as simple_queue:
+                try:
+                    message = simple_queue.get(timeout=0.1)
+                except simple_queue.Empty:
+                    continue
+                message.ack()
+                self.assertEqual(message.headers["task"], task_name)
+                return queue
+        return None
+
+    def test_task_routes(self):
+        expected = {
+            "apps.payments.tasks.process_successful_payment": "payments",
+            "apps.payments.tasks.payment_successful": "invoices",
+            "apps.payments.tasks.order_pending_cancellation": "emails",
+            "apps.orders.tasks.order_created": "emails",
+            "apps.common.tasks.generate_image_variants": "default",
+        }
+        # Every periodic task runs on the maintenance worker
+        for entry in settings.CELERY_BEAT_SCHEDULE.values():
+            expected[entry["task"]] = "maintenance"
+
+        queues = set(expected.values())
+        with app.connection_for_write("memory://") as conn:
+            for task_name, queue in expected.items():
+                self.assertEqual(
+                    self.published_queue(conn, task_name, queues), queue, task_name
+                )
+
+    def test_reliability_settings(self):
+        self.assertTrue(app.conf.task_acks_late)
+        self.assertTrue(app.conf.task_reject_on_worker_lost)
+        self.assertEqual(app.conf.worker_prefetch_multiplier, 1)
+
+
+class TestLeaseLock(SimpleTestCase):
+    def setUp(self):
+        get_redis_client().delete("lock:stats", "lock:test-task")
+
+    def test_single_instance(self):
+        calls = []
+
+        @single_instance(name="test-task")
+        def task():
+            calls.append(1)
+            return "done"
+
+        # Test skipped while another worker holds the lock
+        other = LeaseLock("test-task")
+        self.assertTrue(other.acquire())
+        self.assertIn("Skipped", task())
+        self.assertEqual(calls, [])
+
+        # Test only the holder can release the lock
+        LeaseLock("test-task").release()
+        self.assertIn("Skipped", task())
+        other.release()
+
+        self.assertEqual(task(), "done")
+        self.assertEqual(calls, [1])
+        self.assertEqual(
+            get_lock_stats()["test-task"], {"contended": 2, "acquired": 1}
+        )
+
+    def test_lease_renewal(self):
+        lock = LeaseLock("test-task", ttl=0.3)
+        self.assertTrue(lock.acquire())
+
+        # Test the lease outlives its ttl while held
+        time.sleep(0.8)
+        self.assertFalse(LeaseLock("test-task").acquire())
+        self.assertFalse(lock.lost)
+
+        lock.release()
+        self.assertIsNone(get_redis_client().get("lock:test-task"))
+
+
+class TestRedisCache(SimpleTestCase):
+    def setUp(self):
+        get_cache_redis_client().delete("throttle:anon:10.0.0.1")
+
+    def test_sliding_window_throttle(self):
+        class Throttle(SlidingWindowAnonRateThrottle):
+            rate = "2/min"
+
+        request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        request.user = AnonymousUser()
+
+        # Separate instances stand in for different workers
+        self.assertTrue(Throttle().allow_request(request, None))
+        self.assertTrue(Throttle().allow_request(request, None))
+        throttle = Throttle()
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertTrue(0 < throttle.wait() <= 60)
+
+        # Rejected requests aren't recorded
+        self.assertEqual(get_cache_redis_client().zcard("throttle:anon:10.0.0.1"), 2)
+
+
+class TestSessions(TestCase):
+    def test_cached_db_sessions(self):
+        SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+        store = SessionStore()
+        store["cart"] = "guest"
+        store.save()
+
+        # Test reads served from the cache
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(store.session_key)["cart"], "guest")
+
+        # Test sessions survive a cache flush
+        cache.clear()
+        self.assertEqual(SessionStore(store.session_key)["cart"], "guest")
+
+
+class TestORJSON(SimpleTestCase):
+    def test_renderer_matches_json_renderer(self):
+        data = {
+            "id": uuid.uuid4(),
+            "price": Decimal("1250.50"),
+            "created": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            "updated": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=1))),
+            "date": date(2025, 1, 2),
+            "message": _("Products retrieved successfully"),
+            "text": "Ẹ káàbọ̀ \u2028 \u2029",
+            "counts": {1: 2},
+            "items": [None, True, 1.5, ("a", "b")],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+        # Test indented output (browsable API) is left to JSONRenderer
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_parser(self):
+        body = '{"name": "Ẹ káàbọ̀", "quantity": 2}'.encode()
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            {"name": "Ẹ káàbọ̀", "quantity": 2},
+        )
+
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+class TestCompression(SimpleTestCase):
+    payload = {
+        "results": [{"name": f"Product {i}", "price": "1000.00"} for i in range(100)]
+    }
+
+    def compress(self, response, accept_encoding):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate, br"), "br")
+        self.assertEqual(choose_encoding("gzip, br;q=0.5"), "gzip")
+        self.assertEqual(choose_encoding("br;q=0, *"), "gzip")
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding(""))
+
+    def test_compression(self):
+        response = JsonResponse(self.payload)
+        response["ETag"] = '"abc"'
+        body = response.content
+
+        response = self.compress(response, "gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(brotli.decompress(response.content), body)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+        response = self.compress(JsonResponse(self.payload), "gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), body)
+
+        # Test responses left alone
+        response = self.compress(JsonResponse(self.payload), "identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+        response = self.compress(JsonResponse({"status": "success"}), "br")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        image = HttpResponse(b"\x89PNG" * 500, content_type="image/png")
+        response = self.compress(image, "br")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_compression(self):
+        chunks = [f"row {i}\n".encode() * 50 for i in range(20)]
+        response = StreamingHttpResponse(iter(chunks), content_type="text/csv")
+
+        response = self.compress(response, "gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks)
+        )
+
+
+@app.task(name="apps.common.tests.metrics_task")
+def metrics_task(fail=False):
+    if fail:
+        raise ValueError("Task failed")
+    return "done"
+
+
+class TestMetrics(TestCase):
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_metrics(self):
+        view = resolve("/api/v1/categories/").view_name
+        labels = {"view": view, "method": "GET", "status": "200"}
+        requests = self.sample("http_request_duration_seconds_count", **labels)
+        queries = self.sample("http_request_db_queries_sum", view=view)
+
+        response = self.client.get("/api/v1/categories/")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            self.sample("http_request_duration_seconds_count", **labels), requests + 1
+        )
+        self.assertGreater(
+            self.sample("http_request_db_queries_sum", view=view), queries
+        )
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"http_request_duration_seconds_bucket", response.content)
+        self.assertIn(b"task_lock_events", response.content)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+    @patch("apps.common.signals.MULTIPROCESS", True)
+    @patch("apps.common.signals.multiprocess.mark_process_dead")
+    def test_celery_child_marked_dead(self, mark_process_dead):
+        worker_process_shutdown.send(sender=None, pid=1234, exitcode=0)
+        mark_process_dead.assert_called_once_with(1234)
+
+    def test_redis_metrics(self):
+        gets = self.sample("redis_commands_total", command="GET")
+        sets = self.sample("redis_commands_total", command="SET")
+
+        client = get_redis_client()
+        client.get("metrics:test")
+        pipeline = client.pipeline()
+        pipeline.set("metrics:test", 1)
+        pipeline.get("metrics:test")
+        pipeline.execute()
+        client.delete("metrics:test")
+
+        self.assertEqual(self.sample("redis_commands_total", command="GET"), gets + 2)
+        self.assertEqual(self.sample("redis_commands_total", command="SET"), sets + 1)
+
+    def test_celery_metrics(self):
+        labels = {"task": metrics_task.name, "state": "SUCCESS"}
+        runs = self.sample("celery_task_duration_seconds_count", **labels)
+        failures = self.sample("celery_task_failures_total", task=metrics_task.name)
+
+        metrics_task.apply()
+        metrics_task.apply(kwargs={"fail": True})
+
+        self.assertEqual(
+            self.sample("celery_task_duration_seconds_count", **labels), runs + 1
+        )
+        self.assertEqual(
+            self.sample("celery_task_failures_total", task=metrics_task.name),
+            failures + 1,
+        )
+
+
+def busy_view(request):
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return HttpResponse()
+
+
+class TestProfiler(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            PROFILER_DIR=directory.name, PROFILER_INTERVAL=0.001
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.profiles = directory.name
+
+    def profile(self, **headers):
+        request = RequestFactory().get("/", headers=headers)
+        return ProfilerMiddleware(busy_view)(request)
+
+    def test_profiled_requests(self):
+        # Test requests without a valid token not profiled
+        self.assertFalse(self.profile().has_header("X-Profile-Id"))
+        self.assertFalse(self.profile(X_Profile="invalid").has_header("X-Profile-Id"))
+
+        response = self.profile(X_Profile=make_profile_token())
+        profile_id = response["X-Profile-Id"]
+        path = os.path.join(self.profiles, "_unresolved_", f"{profile_id}.folded")
+        with open(path) as f:
+            self.assertIn("busy_view", f.read())
+
+        # Test sampled traffic profiled without a token
+        with override_settings(PROFILER_SAMPLE_RATE=1):
+            self.assertTrue(self.profile().has_header("X-Profile-Id"))
+
+    @override_settings(PROFILER_MAX_FILES=2)
+    def test_profile_retention(self):
+        profile_ids = [
+            self.profile(X_Profile=make_profile_token())["X-Profile-Id"]
+            for _ in range(3)
+        ]
+
+        # Test only the newest profiles kept
+        saved = os.listdir(os.path.join(self.profiles, "_unresolved_"))
+        expected = [f"{profile_id}.folded" for profile_id in profile_ids[1:]]
+        self.assertEqual(sorted(saved), expected)
+
+    def test_flamegraph(self):
+        for _ in range(2):
+            self.profile(X_Profile=make_profile_token())
+
+        call_command("flamegraph", "--clear", stdout=io.StringIO())
+        with open(os.path.join(self.profiles, "flamegraphs", "_unresolved_.svg")) as f:
+            svg = f.read()
+        self.assertIn("busy_view", svg)
+        self.assertIn("2 requests", svg)
+        self.assertEqual(os.listdir(os.path.join(self.profiles, "_unresolved_")), [])
+
+
+class TestBenchmarkApi(TestCase):
+    def test_scenarios(self):
+        with stub_external_services():
+            dataset = seed_dataset(
+                products=10, reviews_per_product=2, users=3, orders_per_user=2
+            )
+            scenarios = run_scenarios(dataset, requests=2, warmup=1)
+
+        self.assertIn("product_search", scenarios)
+        self.assertIn("checkout", scenarios)
+        for result in scenarios.values():
+            self.assertEqual(result["requests"], 2)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertGreater(result["queries"], 0)
+
+    def test_compare_reports(self):
+        previous = {
+            "scenarios": {
+                "product_list": {"p50_ms": 10, "p95_ms": 20, "queries": 3},
+                "cart_get": {"p50_ms": 5, "p95_ms": 10, "queries": 1},
+            }
+        }
+        current = {
+            "scenarios": {
+                "product_list": {"p50_ms": 10, "p95_ms": 21, "queries": 3},
+                "cart_get": {"p50_ms": 5, "p95_ms": 10, "queries": 2},
+                "checkout": {"p50_ms": 20, "p95_ms": 40, "queries": 12},
+            }
+        }
+        lines, regressions = compare_reports(previous, current, max_regression=10)
+        self.assertEqual(regressions, ["cart_get"])
+        self.assertIn("checkout: new", lines)
+
+        # Test a slower p95 past the threshold regresses
+        _, regressions = compare_reports(previous, current, max_regression=1)
+        self.assertEqual(regressions, ["product_list", "cart_get"])
@@ -0,0 +1,68 @@
+import logging
+import uuid
+
+import redis
+from rest_framework import throttling
+
+from apps.common.redis_client import get_cache_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Keeps each client's request history in a Redis sorted set scored by
+    timestamp, so limits are shared by every worker and node. Expired entries
+    are trimmed, the request recorded and the window counted in one
+    transaction. Requests are let through if Redis is unavailable.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        member = f"{self.now}:{uuid.uuid4().hex}"
+        client = get_cache_redis_client()
+
+        try:
+            pipeline = client.pipeline()
+            pipeline.zremrangebyscore(self.key, 0, self.now - self.duration)
+            pipeline.zadd(self.key, {member: self.now})
+            pipeline.zcard(self.key)
+            pipeline.zrange(self.key, 0, 0, withscores=True)
+            pipeline.expire(self.key, self.duration)
+            _, _, self.count, oldest, _ = pipeline.execute()
+
+            if self.count <= self.num_requests:
+                return True
+
+            # Rejected requests don't use up the window
+            client.zrem(self.key, member)
+        except redis.RedisError as e:
+            logger.warning(f"Throttle history unavailable: {e}")
+            return True
+
+        self.oldest = oldest[0][1] if oldest else self.now
+        return False
+
+    def wait(self):
+        return max(self.oldest + self.duration - self.now, 0)
+
+
+class SlidingWindowAnonRateThrottle(
+    SlidingWindowThrottleMixin, throttling.AnonRateThrottle
+):
+    pass
+
+
+class SlidingWindowUserRateThrottle(
+    SlidingWindowThrottleMixin, throttling.UserRateThrottle
+):
+    pass
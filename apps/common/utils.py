@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.db import connection
+
 from apps.accounts.models import User
+from apps.common.queries import QueryRecorder
 
 
 import logging
@@ -49,4 +53,30 @@ class TestUtil:
             "password": "testpassword789#",
         }
         user = User.objects.create_user(**user_dict)
-        return user
\ No newline at end of file
+        return user
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for declaring how many queries an endpoint may run.
+    Savepoints aren't counted. Repeated query shapes fail the test too, so
+    budgets hold regardless of how many rows the page has.
+    """
+
+    def assertQueryBudget(self, budget, method, url, data=None, **kwargs):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = getattr(self.client, method)(url, data, **kwargs)
+
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        self.assertLessEqual(
+            len(recorder),
+            budget,
+            f"{method.upper()} {url} is over its budget of {budget}. "
+            + recorder.report(threshold),
+        )
+        self.assertFalse(
+            recorder.repeated(threshold),
+            f"{method.upper()} {url} repeats queries. " + recorder.report(threshold),
+        )
+        return response
@@ -1,3 +1,23 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from apps.common.metrics import render_metrics
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint. Kept outside DRF so scrapes aren't throttled
+    and don't go through the API renderers.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        provided = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return HttpResponse(status=403)
+
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
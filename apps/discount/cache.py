@@ -0,0 +1,140 @@
+import json
+import logging
+import time
+from bisect import bisect_right
+from datetime import datetime
+from decimal import Decimal
+
+import redis
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.redis_client import get_redis_client
+from apps.discount.models import Discount
+from apps.orders.choices import DiscountChoices
+
+logger = logging.getLogger(__name__)
+
+TIERED_DISCOUNT_CACHE_KEY = "discount:tiered:v2"
+TIERED_DISCOUNT_CACHE_TIMEOUT = 60 * 60  # Redis copy, refreshed on invalidation
+LOCAL_CACHE_TIMEOUT = 30  # Bounds staleness in other processes after a change
+
+_local_cache = {"table": None, "expires_at": 0}
+
+
+class TieredDiscountTable:
+    """
+    The active tiered discount with its tiers sorted by min_amount,
+    so the tier for a subtotal is found with a binary search.
+    """
+
+    def __init__(self, start_date, end_date, tiers):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.tiers = sorted(tiers, key=lambda tier: tier["min_amount"])
+        self.min_amounts = [tier["min_amount"] for tier in self.tiers]
+
+    @property
+    def is_active(self):
+        return self.start_date <= timezone.now() < self.end_date
+
+    def get_tier(self, subtotal):
+        """Return the tier with the highest min_amount not above the subtotal."""
+        index = bisect_right(self.min_amounts, subtotal)
+        if index == 0:
+            return None
+        return self.tiers[index - 1]
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "start_date": self.start_date.isoformat(),
+                "end_date": self.end_date.isoformat(),
+                "tiers": [
+                    {**tier, "min_amount": str(tier["min_amount"])}
+                    for tier in self.tiers
+                ],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data):
+        data = json.loads(data)
+        tiers = [
+            {**tier, "min_amount": Decimal(tier["min_amount"])}
+            for tier in data["tiers"]
+        ]
+        return cls(
+            datetime.fromisoformat(data["start_date"]),
+            datetime.fromisoformat(data["end_date"]),
+            tiers,
+        )
+
+
+def load_tiered_discount_table():
+    """
+    Build the tier table from the database.
+    Returns None if no tiered discount is configured.
+    """
+    try:
+        discount = Discount.objects.get(discount_type=DiscountChoices.TIERED)
+    except Discount.DoesNotExist:
+        return None
+
+    tiers = discount.tiers.values("min_amount", "discount_percentage", "free_shipping")
+    return TieredDiscountTable(discount.start_date, discount.end_date, list(tiers))
+
+
+def get_tiered_discount_table():
+    """
+    Return the cached tier table, checking the in-process copy, then Redis,
+    then the database. Redis being unavailable falls back to the database.
+    """
+    now = time.monotonic()
+    if _local_cache["expires_at"] > now:
+        return _local_cache["table"]
+
+    client = get_redis_client()
+    try:
+        cached = client.get(TIERED_DISCOUNT_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Tiered discount cache unavailable: {e}")
+        cached = None
+        client = None
+
+    if cached is not None:
+        # An empty string records that no tiered discount is configured
+        table = TieredDiscountTable.from_json(cached) if cached else None
+    else:
+        table = load_tiered_discount_table()
+        if client is not None:
+            try:
+                client.set(
+                    TIERED_DISCOUNT_CACHE_KEY,
+                    table.to_json() if table else "",
+                    ex=TIERED_DISCOUNT_CACHE_TIMEOUT,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to cache tiered discounts: {e}")
+
+    _local_cache["table"] = table
+    _local_cache["expires_at"] = now + LOCAL_CACHE_TIMEOUT
+    return table
+
+
+def clear_tiered_discount_cache():
+    _local_cache["table"] = None
+    _local_cache["expires_at"] = 0
+    try:
+        get_redis_client().delete(TIERED_DISCOUNT_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to clear tiered discount cache: {e}")
+
+
+def invalidate_tiered_discount_cache():
+    """
+    Drop the cached tier table now and again once the transaction commits,
+    so a concurrent checkout can't re-cache the old tiers in between.
+    """
+    clear_tiered_discount_cache()
+    transaction.on_commit(clear_tiered_discount_cache)
@@ -0,0 +1,65 @@
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.discount.models import Discount
+from apps.discount.service import apply_discount_to_products
+from apps.shop.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Applies a discount to every product in the given categories and/or products "
+        "with a single bulk update, without firing per-product signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("discount_id", help="ID of the discount to apply.")
+        parser.add_argument(
+            "--category",
+            action="append",
+            default=[],
+            help="Slug of a category whose products get the discount. Can be repeated.",
+        )
+        parser.add_argument(
+            "--product",
+            action="append",
+            default=[],
+            help="ID of a product to discount. Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        categories = options["category"]
+
+        if not categories and not options["product"]:
+            raise CommandError("Provide at least one --category or --product.")
+
+        try:
+            product_ids = [uuid.UUID(product_id) for product_id in options["product"]]
+        except ValueError:
+            raise CommandError("Product IDs must be valid UUIDs.")
+
+        try:
+            discount = Discount.objects.get(id=options["discount_id"])
+        except (Discount.DoesNotExist, ValidationError):
+            raise CommandError(f"Discount {options['discount_id']} not found.")
+
+        if discount.is_expired:
+            raise CommandError(f"The discount '{discount.name}' is expired.")
+
+        products = Product.objects.filter(
+            Q(category__slug__in=categories) | Q(id__in=product_ids)
+        )
+
+        try:
+            updated_count = apply_discount_to_products(discount, products)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully applied '{discount.name}' to {updated_count} products."
+            )
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.discount.service import recompute_discounted_prices
+from apps.shop.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the discounted price of products from their current price and "
+        "active discount. Run it after changing prices in bulk (e.g. an import)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--category",
+            action="append",
+            default=[],
+            help="Only recompute products in the category with this slug. Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.all()
+        if options["category"]:
+            products = products.filter(category__slug__in=options["category"])
+
+        discounted_count = recompute_discounted_prices(products)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully recomputed prices, {discounted_count} products are discounted."
+            )
+        )
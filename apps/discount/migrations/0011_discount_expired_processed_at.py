@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discount', '0010_alter_tiereddiscount_discount_percentage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discount',
+            name='expired_processed_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When product prices were reset after this discount expired', null=True),
+        ),
+    ]
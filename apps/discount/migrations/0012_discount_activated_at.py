@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discount', '0011_discount_expired_processed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discount',
+            name='activated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When product prices were last computed for this discount', null=True),
+        ),
+    ]
@@ -20,10 +20,34 @@ class Discount(BaseModel):
     value = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
+    activated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When product prices were last computed for this discount",
+    )
+    expired_processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When product prices were reset after this discount expired",
+    )
 
     @property
     def is_active(self):
-        return timezone.now() < self.end_date
+        return self.start_date <= timezone.now() < self.end_date
+
+    @property
+    def is_expired(self):
+        return timezone.now() >= self.end_date
+
+    def save(self, *args, **kwargs):
+        # Let the scheduler recompute prices with the new value and dates
+        self.activated_at = None
+        # An extended discount has to be expired again once it ends
+        if not self.is_expired:
+            self.expired_processed_at = None
+        super().save(*args, **kwargs)
 
     def clean(self):
         if self.end_date < self.start_date:
@@ -50,7 +74,7 @@ class ProductDiscount(BaseModel):
     )
 
     def clean(self):
-        if not self.discount.is_active:
+        if self.discount.is_expired:
             raise ValidationError(
                 {"discount": f"The discount '{self.discount.name}' is expired."}
             )
@@ -72,7 +96,7 @@ class TieredDiscount(BaseModel):
     free_shipping = models.BooleanField(default=False)
 
     def clean(self):
-        if not self.discount.is_active:
+        if self.discount.is_expired:
             raise ValidationError(f"The discount '{self.discount.name}' is expired.")
 
         if self.free_shipping and self.discount_percentage:
@@ -108,7 +132,7 @@ class Coupon(BaseModel):
                 "Coupon discount type has to be 'fixed amount' or 'percentage'"
             )
 
-        if not self.discount.is_active:
+        if self.discount.is_expired:
             raise ValidationError(f"The discount '{self.discount.name}' is expired.")
 
     @property
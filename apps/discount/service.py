@@ -1,14 +1,23 @@
 import logging
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
 from django.db import transaction
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Greatest, Round
+from django.utils import timezone
 
-from apps.discount.models import CouponUsage, ProductDiscount, TieredDiscount
+from apps.discount.cache import get_tiered_discount_table
+from apps.discount.models import Coupon, CouponUsage, Discount, ProductDiscount
 from apps.orders.choices import DiscountChoices
 from apps.payments.tasks import payment_successful, process_successful_payment
+from apps.shop.models import Product
 
 logger = logging.getLogger(__name__)
 
+# Prices round half up, the way SQL ROUND() does in
+# get_discounted_price_expression, so both paths agree to the cent
+PRICE_QUANTUM = Decimal("0.01")
+
 
 def calculate_order_discount(
     subtotal: Decimal, discount_type: str, discount_value: int
@@ -24,15 +33,37 @@ def calculate_order_discount(
     return subtotal - discount_amount
 
 
-def apply_coupon_discount_to_order(coupon, order):
+def redeem_coupon(coupon) -> bool:
+    """
+    Use up one redemption of the coupon in a single conditional UPDATE.
+    Returns False if the coupon has reached its usage limit or isn't active,
+    so concurrent redemptions can never exceed the limit.
+    """
+    now = timezone.now()
+    updated = Coupon.objects.filter(
+        pk=coupon.pk,
+        used_count__lt=F("usage_limit"),
+        discount__start_date__lte=now,
+        discount__end_date__gt=now,
+    ).update(used_count=F("used_count") + 1)
+
+    return updated == 1
+
+
+def apply_coupon_discount_to_order(coupon, order) -> bool:
     """
     Applies coupon discount to an order and records the usage.
+    Returns False without changing the order if the coupon can no longer be redeemed.
     """
     with transaction.atomic():
+        # 1. Redeem the coupon first so the limit holds under concurrent requests
+        if not redeem_coupon(coupon):
+            return False
+
         subtotal = order.calculate_subtotal()
         discount_total = Decimal("0")
 
-        # 1. Calculate discount amount based on type
+        # 2. Calculate discount amount based on type
         discount_type = coupon.discount.discount_type
         discount_value = coupon.discount.value
 
@@ -40,18 +71,15 @@ def apply_coupon_discount_to_order(coupon, order):
             subtotal, discount_type, discount_value
         )
 
-        # 2. Apply the discount
+        # 3. Apply the discount
         order.discounted_total = discount_total
+        order.update_totals()
 
-        order.save()
+        order.save(update_fields=["discounted_total", "subtotal", "total"])
 
-        # 3. Record coupon usage
+        # 4. Record coupon usage
         CouponUsage.objects.create(coupon=coupon, user=order.customer, order=order)
 
-        # 4. Increment usage counter
-        coupon.used_count += 1
-        coupon.save()
-
         # Check if the order total is now 0 (100% discount)
         final_total = order.get_total_cost()
 
@@ -61,9 +89,8 @@ def apply_coupon_discount_to_order(coupon, order):
                 args=[str(order.id)],
                 link=[payment_successful.si(order.id)],
             )
-            return
 
-        return
+        return True
 
 
 def calculate_product_discount(
@@ -76,7 +103,9 @@ def calculate_product_discount(
     elif discount_type == DiscountChoices.FIXED_AMOUNT:
         discount_amount = min(discount_value, product_price)
 
-    return product_price - discount_amount
+    return Decimal(product_price - discount_amount).quantize(
+        PRICE_QUANTUM, rounding=ROUND_HALF_UP
+    )
 
 
 def apply_discount_to_product(product, discount):
@@ -105,44 +134,147 @@ def apply_discount_to_product(product, discount):
         product.save()
 
 
-def apply_discount_to_order(order, discount):
+def get_discounted_price_expression(discount):
     """
-    Applies coupon discount to an order and records the usage.
+    Build the SQL equivalent of calculate_product_discount for the discount,
+    so discounted prices can be set with a single UPDATE.
     """
+    output_field = DecimalField(max_digits=10, decimal_places=2)
+
+    if discount.discount_type == DiscountChoices.PERCENTAGE:
+        return Round(
+            F("price") * Value(Decimal(100 - discount.value)) / Value(Decimal("100")),
+            2,
+            output_field=output_field,
+        )
+
+    if discount.discount_type == DiscountChoices.FIXED_AMOUNT:
+        return Greatest(
+            F("price") - Value(Decimal(discount.value)),
+            Value(Decimal("0")),
+            output_field=output_field,
+        )
+
+    raise ValueError(
+        f"Discount type '{discount.discount_type}' can't be applied to products."
+    )
+
+
+def apply_discount_to_products(discount, products) -> int:
+    """
+    Attach the discount to every product in the queryset and set their
+    discounted prices in bulk. ProductDiscount rows are written with
+    update()/bulk_create(), so the per-row signals don't fire.
+    Returns the number of products updated.
+    """
+    discounted_price = get_discounted_price_expression(discount)
+
+    with transaction.atomic():
+        product_ids = list(products.values_list("id", flat=True))
+
+        # Products already on another discount are moved to this one
+        ProductDiscount.objects.filter(product_id__in=product_ids).exclude(
+            discount=discount
+        ).update(discount=discount)
+
+        existing_ids = set(
+            ProductDiscount.objects.filter(product_id__in=product_ids).values_list(
+                "product_id", flat=True
+            )
+        )
+        ProductDiscount.objects.bulk_create(
+            [
+                ProductDiscount(discount=discount, product_id=product_id)
+                for product_id in product_ids
+                if product_id not in existing_ids
+            ],
+            batch_size=1000,
+        )
+
+        return Product.objects.filter(id__in=product_ids).update(
+            discounted_price=discounted_price if discount.is_active else None,
+            last_updated=timezone.now(),
+        )
+
+
+def recompute_discounted_prices(products) -> int:
+    """
+    Recompute the discounted price of the products from their current price,
+    with one UPDATE per active discount attached to them. Products without an
+    active discount get their discounted price cleared.
+    Returns the number of products that have a discounted price.
+    """
+    now = timezone.now()
+    product_ids = products.values("id")
+
+    active_discounts = Discount.objects.filter(
+        discounts__product__in=product_ids,
+        discount_type__in=[DiscountChoices.PERCENTAGE, DiscountChoices.FIXED_AMOUNT],
+        start_date__lte=now,
+        end_date__gt=now,
+    ).distinct()
+
+    discounted_count = 0
+    with transaction.atomic():
+        for discount in active_discounts:
+            discounted_count += Product.objects.filter(
+                id__in=product_ids, product__discount=discount
+            ).update(
+                discounted_price=get_discounted_price_expression(discount),
+                last_updated=now,
+            )
+
+        Product.objects.filter(
+            id__in=product_ids, discounted_price__isnull=False
+        ).exclude(product__discount__in=active_discounts).update(
+            discounted_price=None, last_updated=now
+        )
+
+    return discounted_count
+
+
+def apply_discount_to_order(order):
+    """
+    Applies the tiered discount (if one is configured) to an order.
+    Tiers are read from the cached tier table instead of the database.
+    """
+    table = get_tiered_discount_table()
+    if table is None:
+        # do nothing if no tiered discount is configured
+        return None
+
     with transaction.atomic():
         subtotal = order.calculate_subtotal()
         logger.info(
             f"Checking tiered discounts for order {order.id} with subtotal {subtotal}"
         )
-        tiered_discount = (
-            TieredDiscount.objects.filter(discount=discount, min_amount__lte=subtotal)
-            .order_by("-min_amount")
-            .first()
-        )
+        tiered_discount = table.get_tier(subtotal)
 
-        if tiered_discount and tiered_discount.discount.is_active:
+        if tiered_discount and table.is_active:
             logger.info(f"Found tiered discount: {tiered_discount}")
-            if tiered_discount.free_shipping:
+            if tiered_discount["free_shipping"]:
                 original_shipping = order.shipping_fee
                 order.shipping_fee = 0
+                order.update_totals()
                 order.save()
                 logger.info(
                     f"Applied free shipping to order {order.id}. Original shipping: {original_shipping}"
                 )
                 return {
                     "discount_type": "free_shipping",
-                    "message": f"Free shipping applied! Spend at least {tiered_discount.min_amount} to get free shipping.",
+                    "message": f"Free shipping applied! Spend at least {tiered_discount['min_amount']} to get free shipping.",
                 }
             else:
                 discount_amount = (
-                    tiered_discount.discount_percentage / Decimal("100")
+                    tiered_discount["discount_percentage"] / Decimal("100")
                 ) * subtotal
                 order.discounted_total = subtotal - discount_amount
+                order.update_totals()
                 order.save()
                 logger.info(
-                    f"Applied {tiered_discount.discount_percentage}% discount to order {order.id}. Saved: {discount_amount}"
+                    f"Applied {tiered_discount['discount_percentage']}% discount to order {order.id}. Saved: {discount_amount}"
                 )
                 return {
                     "discount_type": "percentage",
-                    "message": f"Discount of {tiered_discount.discount_percentage}% applied!",
+                    "message": f"Discount of {tiered_discount['discount_percentage']}% applied!",
                 }
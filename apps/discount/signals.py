@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.discount.cache import invalidate_tiered_discount_cache
+from apps.discount.models import Discount, TieredDiscount
+
+
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+@receiver(post_save, sender=TieredDiscount)
+@receiver(post_delete, sender=TieredDiscount)
+def handle_tiered_discount_change(sender, instance, **kwargs):
+    """Drop the cached tier table when a discount or one of its tiers changes."""
+    invalidate_tiered_discount_cache()
@@ -1,11 +1,20 @@
+import threading
 import uuid
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
 from rest_framework.test import APITestCase
 
 from datetime import timedelta
+from decimal import Decimal
 from django.utils import timezone
 
-from apps.common.utils import TestUtil
-from apps.discount.models import Coupon, Discount
+from apps.common.utils import QueryBudgetMixin, TestUtil
+from apps.discount import cache
+from apps.discount.models import Coupon, Discount, ProductDiscount, TieredDiscount
+from apps.discount.service import redeem_coupon
 from apps.orders.models.order import Order, OrderItem
 
 from apps.shop.test_utils import TestShopUtil
@@ -125,5 +134,182 @@ class TestDiscount(APITestCase):
         response = self.client.post(self.apply_coupon_order_url, coupon_data)
         self.assertEqual(response.status_code, 401)
 
+    def test_tiered_discount_cache(self):
+        cache.clear_tiered_discount_cache()
+
+        # Test no tiered discount configured
+        self.assertIsNone(cache.get_tiered_discount_table())
+
+        # Test cache invalidated when tiers are added
+        discount = Discount.objects.create(
+            name="Tiered Discount",
+            discount_type="tiered",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        TieredDiscount.objects.create(
+            discount=discount, min_amount=5000, free_shipping=True
+        )
+        tier = TieredDiscount.objects.create(
+            discount=discount, min_amount=1000, discount_percentage=10
+        )
+
+        table = cache.get_tiered_discount_table()
+        self.assertIsNone(table.get_tier(Decimal("999")))
+        self.assertEqual(table.get_tier(Decimal("1000"))["discount_percentage"], 10)
+        self.assertTrue(table.get_tier(Decimal("7000"))["free_shipping"])
+
+        # Test lookups are served from the in-process copy, then Redis
+        with self.assertNumQueries(0):
+            cache.get_tiered_discount_table()
+            cache._local_cache["expires_at"] = 0
+            table = cache.get_tiered_discount_table()
+        self.assertEqual(table.get_tier(Decimal("4999"))["discount_percentage"], 10)
+
+        # Test cache invalidated when a tier is deleted
+        tier.delete()
+        table = cache.get_tiered_discount_table()
+        self.assertIsNone(table.get_tier(Decimal("4999")))
+
+    def test_apply_discount_campaign(self):
+        campaign = Discount.objects.create(
+            name="Campaign",
+            discount_type="percentage",
+            value=10,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        # product3 is on another discount and gets moved to the campaign
+        ProductDiscount.objects.create(discount=self.discount, product=self.product3)
+
+        call_command(
+            "apply_discount_campaign",
+            str(campaign.id),
+            "--category",
+            self.product1.category.slug,
+            "--product",
+            str(self.product3.id),
+            stdout=StringIO(),
+        )
+
+        self.product1.refresh_from_db()
+        self.product2.refresh_from_db()
+        self.product3.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, 900)
+        self.assertIsNone(self.product2.discounted_price)
+        self.assertEqual(self.product3.discounted_price, 1800)
+        self.assertEqual(
+            ProductDiscount.objects.filter(discount=campaign).count(), 2
+        )
+
+        # Test fixed amount never goes below zero
+        self.discount.value = 1500
+        self.discount.save()
+        call_command(
+            "apply_discount_campaign",
+            str(self.discount.id),
+            "--product",
+            str(self.product1.id),
+            stdout=StringIO(),
+        )
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, 0)
+
+        # Test tiered discount can't be applied to products
+        tiered = Discount.objects.create(
+            name="Tiered",
+            discount_type="tiered",
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        with self.assertRaises(CommandError):
+            call_command(
+                "apply_discount_campaign",
+                str(tiered.id),
+                "--product",
+                str(self.product1.id),
+                stdout=StringIO(),
+            )
+
+        # Test invalid product ID reported as a command error
+        with self.assertRaisesMessage(CommandError, "valid UUIDs"):
+            call_command(
+                "apply_discount_campaign",
+                str(campaign.id),
+                "--product",
+                "not-a-uuid",
+                stdout=StringIO(),
+            )
+
+
+class TestCouponRedemption(TransactionTestCase):
+    # Rows must be committed so the redeeming threads' connections can see them
+
+    def test_redeem_coupon_concurrently(self):
+        discount = Discount.objects.create(
+            name="Test Discount",
+            discount_type="fixed_amount",
+            value=1000,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        coupon = Coupon.objects.create(code="LIMITED", discount=discount, usage_limit=5)
+
+        threads_count = 20
+        barrier = threading.Barrier(threads_count)
+        results = []
+
+        def redeem():
+            try:
+                barrier.wait()
+                results.append(redeem_coupon(coupon))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=redeem) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Test usage limit holds under contention
+        self.assertEqual(results.count(True), 5)
+        coupon.refresh_from_db()
+        self.assertEqual(coupon.used_count, 5)
+
+        # Test expired coupon can't be redeemed
+        Discount.objects.filter(id=discount.id).update(end_date=timezone.now())
+        coupon.usage_limit = 10
+        coupon.save()
+        self.assertFalse(redeem_coupon(coupon))
+
+
+class TestDiscountQueryBudgets(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user = TestUtil.verified_user()
+        self.product1, _, self.product3 = TestShopUtil.product(self.user)
+
+        self.order = Order.objects.create(customer=self.user.profile)
+        for product in (self.product1, self.product3):
+            OrderItem.objects.create(
+                order=self.order, product=product, quantity=1, price=product.price
+            )
+
+        discount = Discount.objects.create(
+            name="Test Discount",
+            discount_type="fixed_amount",
+            value=100,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        Coupon.objects.create(code="TESTCOUPON", discount=discount, usage_limit=10)
+        self.client.force_authenticate(user=self.user)
+
+    def test_apply_coupon_budget(self):
+        response = self.assertQueryBudget(
+            11, "post", f"/api/v1/orders/{self.order.id}/coupons/", {"code": "TESTCOUPON"}
+        )
+        self.assertEqual(response.status_code, 200)
+
 
 # python manage.py test apps.discount.tests.TestDiscount.test_apply_coupon
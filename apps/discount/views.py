@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -11,7 +12,7 @@ from apps.discount.models import Coupon, CouponUsage
 from apps.discount.serializers import CouponApplySerializer
 from apps.discount.service import apply_coupon_discount_to_order
 from apps.orders.choices import PaymentStatus, ShippingStatus
-from apps.orders.models.order import Order
+from apps.orders.models.order import Order, OrderItem
 from apps.orders.serializers.order import (
     OrderWithDiscountResponseSerializer,
     OrderWithDiscountSerializer,
@@ -61,7 +62,9 @@ class ApplyCouponView(APIView):
                 err_code=ErrorCode.VALIDATION_ERROR,
             )
 
-        coupon = Coupon.objects.get(code=serializer.validated_data["code"])
+        coupon = Coupon.objects.select_related("discount").get(
+            code=serializer.validated_data["code"]
+        )
 
         # 3. Validate coupon against order
         coupon_usage = CouponUsage.objects.filter(coupon=coupon, order=order).exists()
@@ -73,10 +76,22 @@ class ApplyCouponView(APIView):
             )
 
         # 4. Apply discount
-        apply_coupon_discount_to_order(coupon, order)
+        # The coupon may have been used up by a concurrent request since validation
+        if not apply_coupon_discount_to_order(coupon, order):
+            return CustomResponse.error(
+                message="Expired coupon code",
+                err_code=ErrorCode.EXPIRED,
+            )
 
         # Refresh order from DB to ensure we have latest data
-        order.refresh_from_db()
+        order = Order.objects.prefetch_related(
+            Prefetch(
+                "items",
+                queryset=OrderItem.objects.select_related(
+                    "product__category"
+                ).prefetch_related("product__reviews"),
+            )
+        ).get(id=order.id)
 
         # serialize with order
         order_serializer = OrderWithDiscountSerializer(order)
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import time
+
+import redis
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from apps.common.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SITE_DETAIL_CACHE_KEY = "general:site_detail"
+TEAM_MEMBERS_CACHE_KEY = "general:team_members"
+GENERAL_CACHE_TIMEOUT = 60 * 60 * 24  # Refreshed on invalidation
+
+
+class CachedContent:
+    """
+    Serialized response data with the validators clients revalidate against.
+    last_modified is when the entry was built, which is never before the
+    change that invalidated the previous one.
+    """
+
+    def __init__(self, data, etag, last_modified):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def build(cls, data):
+        encoded = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+        etag = f'"{hashlib.md5(encoded.encode()).hexdigest()}"'
+        return cls(json.loads(encoded), etag, int(time.time()))
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "data": self.data,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data):
+        data = json.loads(data)
+        return cls(data["data"], data["etag"], data["last_modified"])
+
+
+def get_cached_content(key, loader):
+    """
+    Return the CachedContent stored under key, building it from loader()
+    on a miss. Redis being unavailable falls back to loader() every time.
+    """
+    client = get_redis_client()
+    try:
+        cached = client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"General content cache unavailable: {e}")
+        return CachedContent.build(loader())
+
+    if cached is not None:
+        return CachedContent.from_json(cached)
+
+    content = CachedContent.build(loader())
+    try:
+        client.set(key, content.to_json(), ex=GENERAL_CACHE_TIMEOUT)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache {key}: {e}")
+    return content
+
+
+def clear_general_content_cache():
+    try:
+        get_redis_client().delete(SITE_DETAIL_CACHE_KEY, TEAM_MEMBERS_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to clear general content cache: {e}")
+
+
+def invalidate_general_content_cache():
+    """
+    Drop the cached content now and again once the transaction commits,
+    so a concurrent request can't re-cache the old content in between.
+    """
+    clear_general_content_cache()
+    transaction.on_commit(clear_general_content_cache)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('general', '0003_alter_sitedetail_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammember',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -2,6 +2,7 @@ from cloudinary.models import CloudinaryField
 from django.db import models
 from django.forms import ValidationError
 
+from apps.common.images import get_public_id
 from apps.common.models import BaseModel
 
 TEAM_MEMBER_FOLDER = "team/"
@@ -50,8 +51,16 @@ class TeamMember(BaseModel):
     role = models.CharField(max_length=255, choices=ROLE_CHOICES)
     description = models.TextField()
     avatar = CloudinaryField("image", folder=TEAM_MEMBER_FOLDER)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     social_links = models.OneToOneField(Social, on_delete=models.SET_NULL, null=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a new avatar can be detected when the member is saved
+        instance._loaded_avatar = get_public_id(instance.__dict__.get("avatar"))
+        return instance
+
     @property
     def avatar_url(self):
         return self.avatar.url
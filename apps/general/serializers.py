@@ -38,6 +38,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
             "role",
             "description",
             "avatar_url",
+            "avatar_variants",
             "social_links",
         ]
 
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.images import queue_image_variants
+from apps.general.cache import invalidate_general_content_cache
+from apps.general.models import SiteDetail, Social, TeamMember
+
+
+@receiver(post_save, sender=SiteDetail)
+@receiver(post_delete, sender=SiteDetail)
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+@receiver(post_save, sender=Social)
+@receiver(post_delete, sender=Social)
+def invalidate_general_content(sender, instance, **kwargs):
+    """
+    Clear the cached site detail and team member responses when the
+    content behind them is edited.
+    """
+    invalidate_general_content_cache()
+
+
+@receiver(post_save, sender=TeamMember)
+def handle_avatar_upload(sender, instance, **kwargs):
+    """Precompute the avatar variants when a new avatar is uploaded."""
+    queue_image_variants(instance, "avatar")
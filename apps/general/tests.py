@@ -1,17 +1,54 @@
 from rest_framework.test import APITestCase
 
+from apps.common.utils import QueryBudgetMixin
+from apps.general.cache import clear_general_content_cache
+from apps.general.models import SiteDetail, Social, TeamMember
+
 
 class TestGeneral(APITestCase):
     site_detail_url = "/api/v1/site-detail/"
     teams_url = "/api/v1/teams/"
     contact_url = "/api/v1/contact/"
 
+    def setUp(self):
+        # Content cached by an earlier test outlives its rolled back rows
+        clear_general_content_cache()
+
     def test_site_detail(self):
         # Test successful retrieval of site detail
         response = self.client.get(self.site_detail_url)
 
         self.assertEqual(response.status_code, 200)
 
+    def test_site_detail_cache(self):
+        response = self.client.get(self.site_detail_url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # Cached response skips the database
+        with self.assertNumQueries(0):
+            response = self.client.get(self.site_detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], etag)
+
+        # Test 304 for a matching ETag or Last-Modified
+        response = self.client.get(self.site_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            self.site_detail_url,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Admin edits invalidate the cache
+        site_detail = SiteDetail.objects.get()
+        site_detail.name = "New Store Name"
+        site_detail.save()
+        response = self.client.get(self.site_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["data"]["name"], "New Store Name")
+
     def test_team_member_list(self):
         # Test successful retrieval of team members
         response = self.client.get(self.teams_url)
@@ -44,4 +81,28 @@ class TestGeneral(APITestCase):
         self.assertEqual(response.status_code, 422)
 
 
+class TestGeneralQueryBudgets(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        clear_general_content_cache()
+        for name in ("Member 1", "Member 2", "Member 3"):
+            TeamMember.objects.create(
+                name=name,
+                role="CO-Founder",
+                description="Test description",
+                avatar="team/avatar",
+                social_links=Social.objects.create(name=name),
+            )
+
+    def test_general_budgets(self):
+        self.assertQueryBudget(3, "get", "/api/v1/site-detail/")
+        self.assertQueryBudget(1, "get", "/api/v1/teams/")
+        data = {
+            "name": "Test User",
+            "email": "test@example.com",
+            "subject": "This is a test subject",
+            "text": "This is a test message",
+        }
+        self.assertQueryBudget(1, "post", "/api/v1/contact/", data)
+
+
 # python manage.py test apps.general.tests.TestGeneral.test_message_create
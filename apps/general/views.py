@@ -1,8 +1,15 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.views import APIView
 
 from apps.common.responses import CustomResponse
+from apps.general.cache import (
+    SITE_DETAIL_CACHE_KEY,
+    TEAM_MEMBERS_CACHE_KEY,
+    get_cached_content,
+)
 from apps.general.schema_examples import (
     MESSAGE_RESPONSE_EXAMPLE,
     SITE_DETAIL_RESPONSE_EXAMPLE,
@@ -14,6 +21,29 @@ from .serializers import MessageSerializer, SiteDetailSerializer, TeamMemberSeri
 
 tags = ["General"]
 
+# Browsers and CDNs may reuse a response this long before revalidating
+GENERAL_CONTENT_MAX_AGE = 60 * 5
+
+
+def cached_content_response(request, content, message):
+    """
+    Return 304 if the client's ETag or Last-Modified still matches the
+    cached content, otherwise the cached data with its validators.
+    """
+    response = get_conditional_response(
+        request, etag=content.etag, last_modified=content.last_modified
+    )
+    if response is None:
+        response = CustomResponse.success(
+            message=message,
+            data=content.data,
+            status_code=status.HTTP_200_OK,
+        )
+    response["ETag"] = content.etag
+    response["Last-Modified"] = http_date(content.last_modified)
+    patch_cache_control(response, public=True, max_age=GENERAL_CONTENT_MAX_AGE)
+    return response
+
 
 class SiteDetailView(APIView):
     serializer_class = SiteDetailSerializer
@@ -27,14 +57,17 @@ class SiteDetailView(APIView):
     )
     def get(self, request):
         """Retrieve the single SiteDetail object."""
-        site_detail, _ = SiteDetail.objects.get_or_create()
-        serializer = self.serializer_class(site_detail)
-        return CustomResponse.success(
-            message="Site detail retrieved successfully.",
-            data=serializer.data,
-            status_code=status.HTTP_200_OK,
+        content = get_cached_content(SITE_DETAIL_CACHE_KEY, self.load_site_detail)
+        return cached_content_response(
+            request, content, "Site detail retrieved successfully."
         )
 
+    def load_site_detail(self):
+        site_detail, _ = SiteDetail.objects.select_related(
+            "company_socials"
+        ).get_or_create()
+        return self.serializer_class(site_detail).data
+
 
 class TeamMemberListView(APIView):
     serializer_class = TeamMemberSerializer
@@ -48,14 +81,15 @@ class TeamMemberListView(APIView):
     )
     def get(self, request):
         """List all TeamMember objects."""
-        team_members = TeamMember.objects.select_related('social_links').all()
-        serializer = self.serializer_class(team_members, many=True)
-        return CustomResponse.success(
-            message="Team members retrieved successfully.",
-            data=serializer.data,
-            status_code=status.HTTP_200_OK,
+        content = get_cached_content(TEAM_MEMBERS_CACHE_KEY, self.load_team_members)
+        return cached_content_response(
+            request, content, "Team members retrieved successfully."
         )
 
+    def load_team_members(self):
+        team_members = TeamMember.objects.select_related('social_links').all()
+        return self.serializer_class(team_members, many=True).data
+
 
 class MessageCreateView(APIView):
     serializer_class = MessageSerializer
@@ -19,6 +19,14 @@ class OrderAdmin(admin.ModelAdmin):
         "created",
         "customer",
         "transaction_id",
+        "total",
     ]
+    list_select_related = ["customer__user"]
+    readonly_fields = ["subtotal", "total"]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Items may have been edited inline, so recompute the stored totals
+        form.instance.refresh_totals()
 
 admin.site.register(models.TrackingNumber)
\ No newline at end of file
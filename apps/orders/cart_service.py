@@ -1,12 +1,13 @@
 from decimal import Decimal
 
 from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 
 from apps.cart.cart import Cart
-from apps.discount.models import Discount
 from apps.discount.service import apply_discount_to_order
-from apps.orders.choices import DiscountChoices
 from apps.orders.models import Order, OrderItem
+from apps.profiles.cache import get_shipping_fee
 from apps.shop.models import Product
 
 
@@ -102,69 +103,83 @@ def process_cart_for_order(request):
 def create_order_from_cart(cart, shipping_address, user_profile):
     """
     Create an order from the cart and reduce stock for purchased items.
+    The subtotal and total are stored on the order so reads don't rescan the items.
     """
     with transaction.atomic():
-        # Create the order
-        # Save the state and shipping fee in case the address is deleted or updated
-        order = Order.objects.create(
-            customer=user_profile,
-            state=shipping_address.state,
-            city=shipping_address.city,
-            street_address=shipping_address.street_address,
-            shipping_fee=shipping_address.shipping_fee,
-            phone_number=shipping_address.phone_number,
-            postal_code=shipping_address.postal_code,
-        )
-
         order_items = []  # List to hold OrderItem instances
         products_to_update = []
+        subtotal = Decimal("0")
+
+        # Lock the product rows to prevent concurrent updates, in one query
+        items = list(cart)
+        products = (
+            Product.objects.select_for_update()
+            .order_by("pk")
+            .in_bulk([item["product"].pk for item in items])
+        )
 
-        # Add items from the cart to the order
-        for item in cart:
-            product = item["product"]
+        # Build the order items from the cart
+        for item in items:
+            product = products[item["product"].pk]
             quantity = item["quantity"]
             price = Decimal(item["price"])
             discounted_price = Decimal(item["discounted_price"])
 
-            # Lock the product row to prevent concurrent updates
-            product = product.__class__.objects.select_for_update().get(pk=product.pk)
-
             # Create order item and reduce stock
             # Set price based on discount
             use_price = discounted_price if discounted_price else price
 
-            order_item = OrderItem(
-                order=order, product=product, quantity=quantity, price=use_price
-            )
+            order_item = OrderItem(product=product, quantity=quantity, price=use_price)
+            # bulk_create skips save(), so capture the product snapshot here
+            order_item.capture_product_snapshot()
 
             order_items.append(order_item)
+            subtotal += order_item.get_cost()
 
             product.in_stock -= quantity
+            product.last_updated = timezone.now()
             products_to_update.append(product)
 
+        # The fee map is current even while address fees are being propagated
+        shipping_fee = get_shipping_fee(shipping_address.state)
+
+        # Create the order
+        # Save the state and shipping fee in case the address is deleted or updated
+        order = Order.objects.create(
+            customer=user_profile,
+            state=shipping_address.state,
+            city=shipping_address.city,
+            street_address=shipping_address.street_address,
+            shipping_fee=shipping_fee,
+            phone_number=shipping_address.phone_number,
+            postal_code=shipping_address.postal_code,
+            subtotal=subtotal,
+            total=subtotal + shipping_fee,
+        )
+
+        for order_item in order_items:
+            order_item.order = order
+
         # Bulk create order items
         OrderItem.objects.bulk_create(order_items)
         
         # Bulk update product stock
-        Product.objects.bulk_update(products_to_update, ['in_stock'])
+        Product.objects.bulk_update(products_to_update, ['in_stock', 'last_updated'])
         
         # After bulk creating items, fetch the order with prefetched items
-        order = Order.objects.prefetch_related('items').get(id=order.id)
+        order = Order.objects.prefetch_related(
+            Prefetch(
+                "items",
+                queryset=OrderItem.objects.select_related(
+                    "product__category"
+                ).prefetch_related("product__reviews"),
+            )
+        ).get(id=order.id)
 
     # Clear the cart after creating the order
     cart.clear()
 
-    # Initialize discount_info to None before the try block
-    discount_info = None
-
     # Apply tiered discount if applicable
-    try:
-        discount = Discount.objects.get(discount_type=DiscountChoices.TIERED)
-
-        discount_info = apply_discount_to_order(order, discount)
-
-    except Discount.DoesNotExist:
-        # do nothing if no tiered discount is configured
-        pass
+    discount_info = apply_discount_to_order(order)
 
     return order, discount_info
@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.orders.models import Order
+
+ITEMS_SUBTOTAL = Coalesce(
+    Sum(
+        F("items__price") * F("items__quantity"),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    ),
+    Value(Decimal("0")),
+    output_field=DecimalField(max_digits=10, decimal_places=2),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the stored subtotal and total of orders from their items. "
+        "Use --check to only report orders whose stored totals are out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report mismatched orders without writing anything.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every order, not only orders missing stored totals.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of orders written per UPDATE batch.",
+        )
+
+    def handle(self, *args, **options):
+        orders = (
+            Order.objects.annotate(items_subtotal=ITEMS_SUBTOTAL)
+            .only("id", "subtotal", "total", "discounted_total", "shipping_fee")
+            .order_by("pk")
+        )
+
+        if options["check"]:
+            self.check_totals(orders)
+            return
+
+        if not options["all"]:
+            orders = orders.filter(Q(subtotal__isnull=True) | Q(total__isnull=True))
+
+        batch_size = options["batch_size"]
+        batch = []
+        updated_count = 0
+
+        for order in orders.iterator(chunk_size=batch_size):
+            order.subtotal = order.items_subtotal
+            order.total = order.calculate_total()
+            batch.append(order)
+
+            if len(batch) >= batch_size:
+                Order.objects.bulk_update(batch, ["subtotal", "total"])
+                updated_count += len(batch)
+                batch = []
+
+        if batch:
+            Order.objects.bulk_update(batch, ["subtotal", "total"])
+            updated_count += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully backfilled totals for {updated_count} orders.")
+        )
+
+    def check_totals(self, orders):
+        checked_count = 0
+        mismatched_count = 0
+
+        for order in orders.iterator(chunk_size=500):
+            checked_count += 1
+            base_amount = (
+                order.discounted_total
+                if order.discounted_total is not None
+                else order.items_subtotal
+            )
+            expected_total = base_amount + order.shipping_fee
+
+            if order.subtotal != order.items_subtotal or order.total != expected_total:
+                mismatched_count += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Order {order.id}: stored subtotal={order.subtotal} total={order.total}, "
+                        f"expected subtotal={order.items_subtotal} total={expected_total}"
+                    )
+                )
+
+        if mismatched_count:
+            raise CommandError(
+                f"{mismatched_count} of {checked_count} orders have out of date totals. "
+                "Run backfill_order_totals to fix them."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"All {checked_count} orders have up to date totals.")
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0018_alter_orderitem_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Sum of all items before discount and shipping', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Final amount payable including discount and shipping fee', max_digits=10, null=True),
+        ),
+    ]
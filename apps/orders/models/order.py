@@ -1,5 +1,6 @@
 from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, F, Sum
 from django.core.validators import MinValueValidator
 
 from apps.common.models import BaseModel
@@ -51,6 +52,20 @@ class Order(BaseModel):
         blank=True,
         help_text="Total cost after applying discounts",
     )
+    subtotal = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Sum of all items before discount and shipping",
+    )
+    total = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Final amount payable including discount and shipping fee",
+    )
 
     # Shipping address details
     state = models.CharField(max_length=100)
@@ -83,10 +98,15 @@ class Order(BaseModel):
         return f"Order {self.id} by {self.customer.user.full_name}"
 
     def calculate_subtotal(self) -> Decimal:
-        """Calculate the subtotal (sum of all items before discount and shipping)."""
-        return sum(item.get_cost() for item in self.items.all())
+        """
+        Return the subtotal (sum of all items before discount and shipping).
+        Falls back to summing the items for orders whose subtotal was never stored.
+        """
+        if self.subtotal is not None:
+            return self.subtotal
+        return sum((item.get_cost() for item in self.items.all()), Decimal("0"))
 
-    def get_total_cost(self) -> Decimal:
+    def calculate_total(self) -> Decimal:
         """Calculate the final total including discount (if any) and shipping fee."""
         base_amount = (
             self.discounted_total
@@ -96,6 +116,35 @@ class Order(BaseModel):
 
         return base_amount + self.shipping_fee
 
+    def get_total_cost(self) -> Decimal:
+        """Return the stored total, computing it only if it was never stored."""
+        if self.total is not None:
+            return self.total
+        return self.calculate_total()
+
+    def update_totals(self):
+        """
+        Recompute the stored totals from the current discount and shipping fee.
+        Does not save; callers include "subtotal" and "total" in their save.
+        """
+        self.subtotal = self.calculate_subtotal()
+        self.total = self.calculate_total()
+
+    def refresh_totals(self):
+        """
+        Recompute the subtotal from the order items in the database
+        and persist both stored totals.
+        """
+        subtotal = self.items.aggregate(
+            subtotal=Sum(
+                F("price") * F("quantity"),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            )
+        )["subtotal"]
+        self.subtotal = subtotal or Decimal("0")
+        self.total = self.calculate_total()
+        self.save(update_fields=["subtotal", "total"])
+
     def update_shipping_status(self, new_status):
         """
         Update the shipping_status and record the timestamp.
@@ -128,8 +177,41 @@ class OrderItem(BaseModel):
     quantity = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
     price = models.DecimalField(max_digits=10, decimal_places=2)
 
+    # Product details captured when the order is placed, so order history
+    # doesn't need to load the full product
+    product_name = models.CharField(max_length=255, blank=True)
+    product_slug = models.SlugField(max_length=255, blank=True)
+    product_image_url = models.URLField(max_length=500, blank=True)
+
+    def save(self, *args, **kwargs):
+        # Items added outside checkout (e.g. admin) still get a snapshot
+        if not self.product_name and self.product_id:
+            self.capture_product_snapshot()
+        super().save(*args, **kwargs)
+
     def get_cost(self):
         return self.price * self.quantity
 
+    def capture_product_snapshot(self):
+        """Copy the product details shown in order history onto the item."""
+        product = self.product
+        self.product_name = product.name
+        self.product_slug = product.slug
+        self.product_image_url = product.get_cropped_image_url() if product.image else ""
+
+    def get_product_snapshot(self):
+        """
+        Return the product details captured at order time.
+        Falls back to the product for items created before snapshots were stored.
+        """
+        if not self.product_name:
+            self.capture_product_snapshot()
+        return {
+            "id": self.product_id,
+            "name": self.product_name,
+            "slug": self.product_slug,
+            "image_url": self.product_image_url,
+        }
+
     def __str__(self):
         return f"{self.quantity} of {self.product} in order {self.order.id}"
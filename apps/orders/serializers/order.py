@@ -24,9 +24,34 @@ class OrderItemSerializer(serializers.ModelSerializer):
         return obj.price * obj.quantity
 
 
+class ProductSnapshotSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    slug = serializers.SlugField()
+    image_url = serializers.URLField(allow_blank=True)
+
+
+class OrderItemSummarySerializer(serializers.ModelSerializer):
+    product = serializers.SerializerMethodField()
+    total = serializers.SerializerMethodField()
+
+    class Meta:
+        model = OrderItem
+        fields = ["id", "product", "price", "quantity", "total"]
+
+    @extend_schema_field(ProductSnapshotSerializer)
+    def get_product(self, obj):
+        return ProductSnapshotSerializer(obj.get_product_snapshot()).data
+
+    @extend_schema_field(serializers.DecimalField(max_digits=10, decimal_places=2))
+    def get_total(self, obj):
+        return obj.price * obj.quantity
+
+
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
     tracking_number = TrackingNumberSerializer(read_only=True)
+    subtotal = serializers.SerializerMethodField()
     total_cost = serializers.SerializerMethodField()
 
     class Meta:
@@ -54,14 +79,26 @@ class OrderSerializer(serializers.ModelSerializer):
             "cancelled_at",
             "created",
             "items",
+            "subtotal",
+            "discounted_total",
             "total_cost",
         ]
 
+    @extend_schema_field(serializers.DecimalField(max_digits=10, decimal_places=2))
+    def get_subtotal(self, obj):
+        return obj.calculate_subtotal()
+
     @extend_schema_field(serializers.DecimalField(max_digits=10, decimal_places=2))
     def get_total_cost(self, obj):
         return obj.get_total_cost()
 
 
+class OrderSummarySerializer(OrderSerializer):
+    """Order with a compact product snapshot per item, used by order history."""
+
+    items = OrderItemSummarySerializer(many=True, read_only=True)
+
+
 class OrderCreateSerializer(
     serializers.ModelSerializer
 ):  # Cart(request) will get it for the authenticated user
@@ -158,3 +195,6 @@ class OrderResponseSerializer(SuccessResponseSerializer):
     
 class OrderWithDiscountResponseSerializer(SuccessResponseSerializer):
     data = OrderWithDiscountSerializer()
+
+class OrderSummaryResponseSerializer(SuccessResponseSerializer):
+    data = OrderSummarySerializer(many=True)
@@ -5,6 +5,7 @@ from django.template.loader import render_to_string
 from datetime import timedelta
 from django.utils import timezone
 
+from apps.common.locks import single_instance
 from apps.orders.choices import PaymentStatus
 from apps.payments.tasks import order_pending_cancellation
 from apps.orders.models import Order
@@ -61,6 +62,7 @@ def order_canceled(order_id):
 
 
 @shared_task
+@single_instance()
 def cancel_expired_orders():
     """
     Restore stock, and send emails to customers for orders that are
@@ -115,6 +117,7 @@ def delete_expired_orders():
 
 
 @shared_task
+@single_instance()
 def check_pending_orders():
     """
     Periodically check for pending orders and send an email notification if not already sent.
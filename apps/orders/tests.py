@@ -1,11 +1,16 @@
 from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.utils import timezone
 import uuid
 from rest_framework.test import APITestCase
 
-from apps.common.utils import TestUtil
+from apps.common.utils import QueryBudgetMixin, TestUtil
+from apps.discount.cache import clear_tiered_discount_cache
 from apps.discount.models import Discount, TieredDiscount
-from apps.orders.models.order import Order
+from apps.orders.models.order import Order, OrderItem
+from apps.profiles.cache import clear_shipping_fee_cache
 from apps.profiles.models import ShippingAddress, ShippingFee
 from apps.shop.test_utils import TestShopUtil
 
@@ -13,9 +18,14 @@ from apps.shop.test_utils import TestShopUtil
 class TestOrders(APITestCase):
     order_create_url = "/api/v1/orders/create/"
     order_history_url = "/api/v1/orders/history/"
+    order_history_summary_url = "/api/v1/orders/history/summary/"
     cart_add_url = "/api/v1/cart/add/"
 
     def setUp(self):
+        # Tier table and fee map cached by an earlier test outlive its rolled back rows
+        clear_tiered_discount_cache()
+        clear_shipping_fee_cache()
+
         self.user1 = TestUtil.verified_user()
         self.user2 = TestUtil.other_verified_user()
 
@@ -149,5 +159,112 @@ class TestOrders(APITestCase):
         response = self.client.get(self.order_history_url)
         self.assertEqual(response.status_code, 401)
 
+    def test_order_totals_stored(self):
+        order_data = {"shipping_id": str(self.shipping_address1.id)}
+
+        response = self.client.post(self.order_create_url, order_data)
+        self.assertEqual(response.status_code, 201)
+
+        # 2 x 1000 for product1 plus 5000 shipping fee for Lagos
+        order = Order.objects.get(customer=self.user1.profile)
+        self.assertEqual(order.subtotal, 2000)
+        self.assertEqual(order.total, 7000)
+        self.assertEqual(response.data["data"]["order"]["total_cost"], 7000)
+
+        # Test backfill for orders created before totals were stored
+        Order.objects.filter(id=order.id).update(subtotal=None, total=None)
+        call_command("backfill_order_totals", stdout=StringIO())
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, 2000)
+        self.assertEqual(order.total, 7000)
+        call_command("backfill_order_totals", "--check", stdout=StringIO())
+
+        # Test check fails for out of date totals
+        Order.objects.filter(id=order.id).update(total=1)
+        with self.assertRaises(CommandError):
+            call_command("backfill_order_totals", "--check", stdout=StringIO())
+
+    def test_order_history_summary(self):
+        order_data = {"shipping_id": str(self.shipping_address1.id)}
+        self.client.post(self.order_create_url, order_data)
+
+        # Snapshot is captured at order time
+        item = OrderItem.objects.get(order__customer=self.user1.profile)
+        self.assertEqual(item.product_name, self.product1.name)
+        self.assertEqual(item.product_slug, self.product1.slug)
+
+        # Test success(200)
+        response = self.client.get(self.order_history_summary_url)
+        self.assertEqual(response.status_code, 200)
+        product = response.data["data"][0]["items"][0]["product"]
+        self.assertEqual(
+            set(product.keys()), {"id", "name", "slug", "image_url"}
+        )
+        self.assertEqual(product["name"], self.product1.name)
+
+        # Snapshot is kept when the product changes later
+        self.product1.name = "Renamed Product"
+        self.product1.save()
+        response = self.client.get(self.order_history_summary_url)
+        product = response.data["data"][0]["items"][0]["product"]
+        self.assertEqual(product["name"], "Test Product 1")
+
+        # Query count doesn't grow with the number of orders
+        self.client.post(self.cart_add_url, {"product_id": str(self.product3.id), "quantity": 1})
+        self.client.post(self.order_create_url, order_data)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.order_history_summary_url)
+        self.assertEqual(len(response.data["data"]), 2)
+
+        # Test 401
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.order_history_summary_url)
+        self.assertEqual(response.status_code, 401)
+
+
+class TestOrderQueryBudgets(QueryBudgetMixin, APITestCase):
+    cart_add_url = "/api/v1/cart/add/"
+
+    def setUp(self):
+        clear_tiered_discount_cache()
+        clear_shipping_fee_cache()
+
+        self.user = TestUtil.verified_user()
+        self.product1, _, self.product3 = TestShopUtil.product(self.user)
+        ShippingFee.objects.create(state="Lagos", fee=5000)
+        self.shipping_address = ShippingAddress.objects.create(
+            user=self.user.profile,
+            phone_number="1234567890",
+            state="Lagos",
+            postal_code="100001",
+            city="Lagos",
+            street_address="123 Test Street",
+            default=True,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_order_budgets(self):
+        order_data = {"shipping_id": str(self.shipping_address.id)}
+        # Same budget for one cart item or several
+        for products in ((self.product1, self.product3), (self.product1,)):
+            for product in products:
+                self.client.post(
+                    self.cart_add_url, {"product_id": str(product.id), "quantity": 1}
+                )
+            response = self.assertQueryBudget(
+                12, "post", "/api/v1/orders/create/", order_data
+            )
+            self.assertEqual(response.status_code, 201)
+
+        self.assertQueryBudget(4, "get", "/api/v1/orders/history/")
+        self.assertQueryBudget(3, "get", "/api/v1/orders/history/summary/")
+
+        # Row labels read the customer's user, which must be joined in
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.assertQueryBudget(6, "get", "/admin/orders/order/")
+        self.assertEqual(response.status_code, 200)
+
 
 # python manage.py test apps.orders.tests.TestOrders.test_order_create
@@ -5,5 +5,6 @@ from . import views
 urlpatterns = [
     path("create/", views.OrderCreateView.as_view()),
     path("history/", views.OrderHistoryGenericAPIView.as_view()),
+    path("history/summary/", views.OrderHistorySummaryGenericAPIView.as_view()),
 ]
 
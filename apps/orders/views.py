@@ -12,7 +12,11 @@ from apps.orders.filters import OrderFilter
 from apps.orders.models import Order
 from apps.orders.models.order import OrderItem
 from apps.orders.serializers import OrderCreateSerializer, OrderSerializer
-from apps.orders.serializers.order import OrderResponseSerializer
+from apps.orders.serializers.order import (
+    OrderResponseSerializer,
+    OrderSummaryResponseSerializer,
+    OrderSummarySerializer,
+)
 from apps.orders.tasks import order_created
 
 tags = ["orders"]
@@ -211,3 +215,61 @@ class OrderHistoryGenericAPIView(ListAPIView):
         Retrieve the order history of the authenticated user.
         """
         return super().get(request)
+
+
+class OrderHistorySummaryGenericAPIView(OrderHistoryGenericAPIView):
+    serializer_class = OrderSummarySerializer
+
+    def get_queryset(self):
+        """
+        Return orders belonging to the authenticated user with only the
+        item and product columns needed for the product snapshot.
+        """
+
+        # Check if this is a schema generation request
+        if getattr(self, "swagger_fake_view", False):
+            # Return an empty queryset to prevent errors during schema generation
+            return Order.objects.none()
+
+        return (
+            Order.objects.filter(customer=self.request.user.profile)
+            .select_related("tracking_number")
+            .prefetch_related(
+                Prefetch(
+                    "items",
+                    queryset=OrderItem.objects.select_related("product").only(
+                        "order",
+                        "product",
+                        "price",
+                        "quantity",
+                        "product_name",
+                        "product_slug",
+                        "product_image_url",
+                        # Only read for items created before snapshots were stored
+                        "product__name",
+                        "product__slug",
+                        "product__image",
+                    ),
+                )
+            )
+            .order_by("-created")
+        )
+
+    @extend_schema(
+        summary="Retrieve Order History Summary",
+        description=(
+            "Retrieves all orders placed by the authenticated user with a compact product snapshot "
+            "(id, name, slug, image URL) captured when each order was placed. "
+            "Supports filtering by shipping status."
+        ),
+        tags=tags,
+        responses={
+            200: OrderSummaryResponseSerializer,
+            401: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request):
+        """
+        Retrieve the order history summary of the authenticated user.
+        """
+        return super().get(request)
@@ -1,6 +1,6 @@
 from io import BytesIO
 from django.db import transaction
-import weasyprint, logging
+import logging
 from celery import shared_task
 from django.contrib.staticfiles import finders
 from django.core.mail import EmailMessage
@@ -64,6 +64,9 @@ def payment_successful(order_id):
                 "order": order,
             },
         )
+        # Imported here so web workers don't load Pango/Cairo at startup
+        import weasyprint
+
         out = BytesIO()
         stylesheets = [weasyprint.CSS(finders.find("pdf.css"))]
         weasyprint.HTML(string=html).write_pdf(out, stylesheets=stylesheets)
@@ -1,7 +1,13 @@
+import hashlib
+import hmac
+import json
 import uuid
+from unittest.mock import patch
+
+from decouple import config
 from rest_framework.test import APITestCase
 
-from apps.common.utils import TestUtil
+from apps.common.utils import QueryBudgetMixin, TestUtil
 from apps.orders.models.order import Order, OrderItem
 from apps.shop.test_utils import TestShopUtil
 
@@ -102,4 +108,77 @@ class TestPayments(APITestCase):
         response = self.client.post(self.initiate_payment_paystack_url, payment_data)
 
 
+@patch("apps.payments.webhooks.process_successful_payment.apply_async")
+class TestPaymentQueryBudgets(QueryBudgetMixin, APITestCase):
+    url = "/api/v1/payments/"
+
+    def setUp(self):
+        self.user = TestUtil.verified_user()
+        self.product1, _, self.product3 = TestShopUtil.product(self.user)
+
+        self.order = Order.objects.create(customer=self.user.profile, tx_ref="ref")
+        for product in (self.product1, self.product3):
+            OrderItem.objects.create(
+                order=self.order, product=product, quantity=1, price=product.price
+            )
+        self.client.force_authenticate(user=self.user)
+
+    # Budget the database work only, the gateways are mocked
+    @patch("apps.payments.views.requests.post")
+    def test_initiate_payment_budgets(self, mock_post, mock_apply_async):
+        mock_post.return_value.json.return_value = {"status": "success"}
+        for path, method in (
+            ("flw/initiate-payment/", "flutterwave"),
+            ("paystack/initialize-transaction/", "paystack"),
+        ):
+            data = {"order_id": self.order.id, "payment_method": method}
+            response = self.assertQueryBudget(4, "post", f"{self.url}{path}", data)
+            self.assertEqual(response.status_code, 200)
+
+        self.order.refresh_from_db()
+        params = {
+            "status": "successful",
+            "tx_ref": self.order.tx_ref,
+            "transaction_id": "1",
+        }
+        response = self.assertQueryBudget(
+            1, "get", f"{self.url}flw/payment-callback/", params
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @patch("apps.payments.webhooks.requests.get")
+    def test_webhook_budgets(self, mock_get, mock_apply_async):
+        charge = {"id": 1, "tx_ref": "ref", "amount": 2000, "currency": "NGN"}
+        mock_get.return_value.json.return_value = {
+            "data": {**charge, "status": "successful"}
+        }
+        payload = {"event": "charge.completed", "data": {**charge, "status": "successful"}}
+        response = self.assertQueryBudget(
+            3,
+            "post",
+            f"{self.url}flw-webhook/",
+            payload,
+            format="json",
+            HTTP_VERIF_HASH=config("FLW_SECRET_HASH"),
+        )
+        self.assertEqual(response.status_code, 200)
+
+        body = json.dumps(
+            {"event": "charge.success", "data": {"reference": "ref", "status": "success"}}
+        ).encode()
+        signature = hmac.new(
+            config("PAYSTACK_TEST_SECRET_KEY").encode(), body, hashlib.sha512
+        ).hexdigest()
+        response = self.assertQueryBudget(
+            1,
+            "post",
+            f"{self.url}paystack-webhook/",
+            body,
+            content_type="application/json",
+            HTTP_X_PAYSTACK_SIGNATURE=signature,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+
 # python manage.py test apps.payments.tests.TestPayments.test_flw
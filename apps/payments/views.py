@@ -48,7 +48,9 @@ class PaymentCallbackFlw(APIView):
         except Order.DoesNotExist:
             logger.error(f"Order not found for tx_ref: {tx_ref}.")
             return CustomResponse.error(
-                message="Order not found", status_code=status.HTTP_404_NOT_FOUND
+                message="Order not found",
+                err_code=ErrorCode.NON_EXISTENT,
+                status_code=status.HTTP_404_NOT_FOUND,
             )
 
         # Provide feedback based on the payment status
@@ -0,0 +1,80 @@
+import json
+import logging
+import time
+
+import redis
+from django.db import transaction
+
+from apps.common.redis_client import get_redis_client
+from apps.profiles.models import ShippingFee
+
+logger = logging.getLogger(__name__)
+
+SHIPPING_FEE_CACHE_KEY = "profiles:shipping_fees"
+SHIPPING_FEE_CACHE_TIMEOUT = 60 * 60 * 24  # Redis copy, refreshed on invalidation
+LOCAL_CACHE_TIMEOUT = 30  # Bounds staleness in other processes after a change
+
+_local_cache = {"fees": None, "expires_at": 0}
+
+
+def load_shipping_fee_map():
+    return dict(ShippingFee.objects.values_list("state", "fee"))
+
+
+def get_shipping_fee_map():
+    """
+    Return the state -> fee map, checking the in-process copy, then Redis,
+    then the database. Redis being unavailable falls back to the database.
+    """
+    now = time.monotonic()
+    if _local_cache["expires_at"] > now:
+        return _local_cache["fees"]
+
+    client = get_redis_client()
+    try:
+        cached = client.get(SHIPPING_FEE_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Shipping fee cache unavailable: {e}")
+        cached = None
+        client = None
+
+    if cached is not None:
+        fees = json.loads(cached)
+    else:
+        fees = load_shipping_fee_map()
+        if client is not None:
+            try:
+                client.set(
+                    SHIPPING_FEE_CACHE_KEY,
+                    json.dumps(fees),
+                    ex=SHIPPING_FEE_CACHE_TIMEOUT,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to cache shipping fees: {e}")
+
+    _local_cache["fees"] = fees
+    _local_cache["expires_at"] = now + LOCAL_CACHE_TIMEOUT
+    return fees
+
+
+def get_shipping_fee(state):
+    """Return the shipping fee for a state, 0 if none is configured."""
+    return get_shipping_fee_map().get(state, 0)
+
+
+def clear_shipping_fee_cache():
+    _local_cache["fees"] = None
+    _local_cache["expires_at"] = 0
+    try:
+        get_redis_client().delete(SHIPPING_FEE_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to clear shipping fee cache: {e}")
+
+
+def invalidate_shipping_fee_cache():
+    """
+    Drop the cached fees now and again once the transaction commits,
+    so a concurrent request can't re-cache the old fee in between.
+    """
+    clear_shipping_fee_cache()
+    transaction.on_commit(clear_shipping_fee_cache)
@@ -79,12 +79,10 @@ class ShippingAddress(BaseModel):
         """
         Override the save method to dynamically set the shipping fee based on the state.
         """
-        try:
-            # Retrieve the shipping fee for the selected state
-            shipping_fee_instance = ShippingFee.objects.get(state=self.state)
-            self.shipping_fee = shipping_fee_instance.fee
-        except ShippingFee.DoesNotExist:
-            self.shipping_fee = 0  # Default to 0 if no fee is found
+        from apps.profiles.cache import get_shipping_fee
+
+        # Read from the cached fee map, 0 if no fee is configured for the state
+        self.shipping_fee = get_shipping_fee(self.state)
 
         if self.default:
             # Find all other addresses for this user that are currently default
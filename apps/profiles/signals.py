@@ -1,17 +1,19 @@
-import logging
-
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from apps.profiles.models import ShippingAddress, ShippingFee
+from apps.profiles.cache import invalidate_shipping_fee_cache
+from apps.profiles.models import ShippingFee
+from apps.profiles.tasks import propagate_shipping_fee
 
 
 @receiver(post_save, sender=ShippingFee)
-def update_shipping_addresses(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=ShippingFee)
+def update_shipping_addresses(sender, instance, **kwargs):
     """
-    Update all shipping addresses with the new shipping fee when a ShippingFee is updated.
+    Refresh the cached fee map and update the shipping addresses for the state
+    in the background when a ShippingFee changes. Checkout reads the fee from
+    the map, so orders use the new fee before the addresses catch up.
     """
-    # Find all shipping addresses for this state and update them
-    ShippingAddress.objects.filter(state=instance.state).update(
-        shipping_fee=instance.fee
-    )
+    invalidate_shipping_fee_cache()
+    transaction.on_commit(lambda: propagate_shipping_fee.delay(instance.state))
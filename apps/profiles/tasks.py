@@ -0,0 +1,37 @@
+import logging
+
+from celery import shared_task
+
+from apps.profiles.models import ShippingAddress, ShippingFee
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def propagate_shipping_fee(state, chunk_size=1000):
+    """
+    Copy the current fee for a state onto its shipping addresses in chunks,
+    so an admin edit doesn't hold a lock on every address in the state at once.
+    """
+    # Read from the database, the worker's in-process fee map may be stale
+    fee = (
+        ShippingFee.objects.filter(state=state).values_list("fee", flat=True).first()
+        or 0
+    )
+    addresses = ShippingAddress.objects.filter(state=state).exclude(shipping_fee=fee)
+    updated = 0
+
+    try:
+        while True:
+            ids = list(addresses.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            updated += ShippingAddress.objects.filter(id__in=ids).update(
+                shipping_fee=fee
+            )
+    except Exception as e:
+        logger.error(f"Error propagating shipping fee for {state}: {e}")
+        return f"Error: {str(e)}"
+
+    logger.info(f"Updated {updated} shipping addresses in {state} to ₦{fee}")
+    return f"Updated {updated} shipping addresses in {state}"
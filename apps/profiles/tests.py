@@ -1,11 +1,15 @@
 import uuid
+from unittest.mock import patch
+
 from rest_framework.test import APITestCase
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 
-from apps.common.utils import TestUtil
-from apps.profiles.models import Profile
+from apps.common.utils import QueryBudgetMixin, TestUtil
+from apps.profiles.cache import clear_shipping_fee_cache, get_shipping_fee_map
+from apps.profiles.models import Profile, ShippingAddress, ShippingFee
+from apps.profiles.tasks import propagate_shipping_fee
 from apps.profiles.test_utils import TestProfileUtil
 
 
@@ -16,6 +20,9 @@ class TestProfiles(APITestCase):
     shipping_address_list_url = "/api/v1/shipping-addresses/"
 
     def setUp(self):
+        # Fee map cached by an earlier test outlives its rolled back rows
+        clear_shipping_fee_cache()
+
         self.user1 = TestUtil.verified_user()
         self.user2 = TestUtil.other_verified_user()
 
@@ -79,6 +86,34 @@ class TestProfiles(APITestCase):
         response = self.client.post(self.shipping_address_create_url, valid_data)
         self.assertEqual(response.status_code, 401)
 
+    def test_shipping_fee_cache(self):
+        # Fee is read from the cached map without querying ShippingFee
+        self.assertEqual(self.address1.shipping_fee, 5000)
+        self.assertEqual(get_shipping_fee_map(), {"Lagos": 5000})
+        with self.assertNumQueries(1):
+            self.address2.save()
+        self.assertEqual(self.address2.shipping_fee, 0)
+
+        # Changing a fee refreshes the map, and checkout sees it straight away
+        fee = ShippingFee.objects.get(state="Lagos")
+        fee.fee = 7000
+        fee.save()
+        self.assertEqual(get_shipping_fee_map(), {"Lagos": 7000})
+
+        # Addresses are updated by the background job
+        ShippingAddress.objects.filter(id=self.address1.id).update(shipping_fee=5000)
+        result = propagate_shipping_fee("Lagos", chunk_size=1)
+        self.assertIn("Updated 1", result)
+        self.address1.refresh_from_db()
+        self.assertEqual(self.address1.shipping_fee, 7000)
+
+        # Removing a fee falls back to 0
+        fee.delete()
+        self.assertEqual(get_shipping_fee_map(), {})
+        propagate_shipping_fee("Lagos")
+        self.address1.refresh_from_db()
+        self.assertEqual(self.address1.shipping_fee, 0)
+
     def test_shipping_address_list(self):
         # Test 200 for authenticated users
         self.client.force_authenticate(user=self.user1)
@@ -258,4 +293,55 @@ class TestProfiles(APITestCase):
         self.assertEqual(response.status_code, 401)
 
 
+class TestProfileQueryBudgets(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        clear_shipping_fee_cache()
+        self.user1 = TestUtil.verified_user()
+        self.user2 = TestUtil.other_verified_user()
+        self.address1, _, _ = TestProfileUtil.shipping_address(
+            self.user1.profile, self.user2.profile
+        )
+        self.client.force_authenticate(user=self.user1)
+
+    def test_profile_budgets(self):
+        self.assertQueryBudget(0, "get", "/api/v1/profile/")
+        self.assertQueryBudget(1, "patch", "/api/v1/profile/", {"first_name": "New"})
+
+        image = SimpleUploadedFile(
+            "avatar.gif",
+            b"GIF87a\x01\x00\x01\x00\x80\x01\x00\x00\x00\x00ccc,\x00\x00\x00\x00"
+            b"\x01\x00\x01\x00\x00\x02\x02D\x01\x00;",
+            content_type="image/gif",
+        )
+        # Budget the database work only, the upload itself goes to Cloudinary
+        storage = "cloudinary_storage.storage.MediaCloudinaryStorage._save"
+        with patch(storage, return_value="avatars/avatar.gif"):
+            response = self.assertQueryBudget(
+                1,
+                "patch",
+                "/api/v1/profile/avatar/",
+                {"avatar": image},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_shipping_address_budgets(self):
+        url = "/api/v1/shipping-addresses/"
+        detail_url = f"{url}{self.address1.id}/"
+        data = {
+            "phone_number": "8011111111",
+            "state": "Lagos",
+            "postal_code": "100001",
+            "city": "Ikeja",
+            "street_address": "1 Budget Street",
+            "default": True,
+        }
+
+        self.assertQueryBudget(2, "post", f"{url}add/", data)
+        self.assertQueryBudget(1, "get", url)
+        self.assertQueryBudget(1, "get", detail_url)
+        self.assertQueryBudget(2, "patch", detail_url, {"city": "Yaba"})
+        self.assertQueryBudget(2, "delete", detail_url)
+
+
 # python manage.py test apps.profiles.tests.TestProfiles.test_shipping_address_create
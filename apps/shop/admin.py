@@ -35,7 +35,10 @@ class CategoryAdmin(admin.ModelAdmin):
         return super().get_queryset(request).annotate(products_count=Count("products"))
 
 
-admin.site.register(models.Review)
+@admin.register(models.Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "rating", "created"]
+    list_select_related = ["customer__user", "product"]
 
 
 @admin.register(models.Wishlist)
@@ -45,4 +48,5 @@ class WishlistAdmin(admin.ModelAdmin):
     search_fields = ["profile__user__full_name"]
     date_hierarchy = "added_at"
     ordering = ["-added_at"]
+    list_select_related = ["profile__user"]
     filter_horizontal = ("products",)
@@ -0,0 +1,111 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.parsers import ORJSONParser
+from apps.common.renderers import ORJSONRenderer
+from apps.shop.management.commands.benchmark_product_serialization import (
+    build_product,
+)
+from apps.shop.serializers import ProductSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer/JSONParser with the orjson pair on pages of "
+        "serialized products, and checks both renderers produce the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Number of products per page.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=20,
+            help="Number of pages rendered per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs; the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        pages = [
+            self.build_page(page, page_size) for page in range(options["pages"])
+        ]
+
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        for page in pages:
+            if stdlib.render(page) != fast.render(page):
+                raise CommandError("ORJSONRenderer output differs from JSONRenderer.")
+
+        bodies = [stdlib.render(page) for page in pages]
+        repeat = options["repeat"]
+        results = [
+            (
+                "Render",
+                self.time_render(stdlib, pages, repeat),
+                self.time_render(fast, pages, repeat),
+            ),
+            (
+                "Parse",
+                self.time_parse(JSONParser(), bodies, repeat),
+                self.time_parse(ORJSONParser(), bodies, repeat),
+            ),
+        ]
+
+        self.stdout.write(f"Pages per run: {len(pages)} x {page_size} products")
+        for name, stdlib_time, orjson_time in results:
+            per_page_stdlib = stdlib_time / len(pages) * 1_000_000
+            per_page_orjson = orjson_time / len(pages) * 1_000_000
+            self.stdout.write(
+                f"{name}: json {per_page_stdlib:.1f} µs/page, "
+                f"orjson {per_page_orjson:.1f} µs/page "
+                f"({per_page_stdlib / per_page_orjson:.2f}x)"
+            )
+        self.stdout.write(self.style.SUCCESS("Rendered output is identical."))
+
+    def build_page(self, page, page_size):
+        products = [
+            build_product(page * page_size + index) for index in range(page_size)
+        ]
+        # Same envelope as CustomResponse with a paginated payload
+        return {
+            "status": "success",
+            "message": "Products retrieved successfully",
+            "data": {
+                "count": page_size,
+                "next": None,
+                "previous": None,
+                "results": ProductSerializer(products, many=True).data,
+            },
+        }
+
+    def time_render(self, renderer, pages, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                renderer.render(page)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def time_parse(self, parser, bodies, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for body in bodies:
+                parser.parse(io.BytesIO(body))
+            timings.append(time.perf_counter() - start)
+        return min(timings)
@@ -0,0 +1,84 @@
+import time
+import uuid
+from decimal import Decimal
+
+from cloudinary import CloudinaryResource
+from django.core.management.base import BaseCommand
+
+from apps.common.images import clear_image_url_cache, image_url_cache_info
+from apps.shop.models import Product, Review
+from apps.shop.serializers import ProductSerializer
+
+
+def build_product(index):
+    """Build an unsaved product that serializes without touching the database."""
+    product = Product(
+        id=uuid.uuid4(),
+        name=f"Product {index}",
+        slug=f"product-{index}",
+        description="Benchmark product",
+        price=Decimal("1000.00"),
+        in_stock=10,
+        image=CloudinaryResource(
+            public_id=f"products/benchmark-{index}",
+            format="jpg",
+            version="1700000000",
+            type="upload",
+            resource_type="image",
+        ),
+    )
+    # avg_rating reads the reviews, keep that off the database
+    product._prefetched_objects_cache = {"reviews": Review.objects.none()}
+    return product
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the per-product cost of ProductSerializer with a cold and a "
+        "warm image URL cache. Products are built in memory, nothing is queried."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=500,
+            help="Number of products serialized per run.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of runs; the fastest one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        products = [build_product(index) for index in range(options["products"])]
+
+        cold = min(
+            self.time_serialization(products, clear_cache=True)
+            for _ in range(options["repeat"])
+        )
+        warm = min(
+            self.time_serialization(products, clear_cache=False)
+            for _ in range(options["repeat"])
+        )
+
+        per_product_cold = cold / len(products) * 1_000_000
+        per_product_warm = warm / len(products) * 1_000_000
+        self.stdout.write(f"Products per run: {len(products)}")
+        self.stdout.write(f"Cold URL cache:  {per_product_cold:.1f} µs/product")
+        self.stdout.write(f"Warm URL cache:  {per_product_warm:.1f} µs/product")
+        self.stdout.write(f"URL cache: {image_url_cache_info()}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warm cache is {per_product_cold / per_product_warm:.2f}x faster per product."
+            )
+        )
+
+    def time_serialization(self, products, clear_cache):
+        if clear_cache:
+            clear_image_url_cache()
+        start = time.perf_counter()
+        ProductSerializer(products, many=True).data
+        return time.perf_counter() - start
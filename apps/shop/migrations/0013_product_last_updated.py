@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0012_alter_review_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='last_updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -8,6 +8,7 @@ from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.images import build_image_url, get_public_id
 from apps.common.models import BaseModel
 from apps.common.validators import validate_file_size
 from apps.profiles.models import Profile
@@ -51,11 +52,24 @@ class Product(BaseModel):
     image = CloudinaryField(
         "image", folder="products/", validators=[validate_file_size]
     )
+    # Variant URLs by size name, filled in by the generate_image_variants task
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Bulk updates bypass auto_now, so they set this explicitly
+    last_updated = models.DateTimeField(auto_now=True)
     objects = ProductManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a price or image change can be detected when the product is saved
+        instance._loaded_price = instance.__dict__.get("price")
+        instance._loaded_image = get_public_id(instance.__dict__.get("image"))
+        return instance
+
     def get_cropped_image_url(self, width=250, height=250):
         # Generate a cropped image URL using Cloudinary transformations
-        return CloudinaryImage(self.image.public_id).build_url(
+        return build_image_url(
+            CloudinaryImage(self.image.public_id),
             width=width,
             height=height,
             crop="fill",
@@ -79,7 +93,7 @@ class Product(BaseModel):
 
     @property
     def image_url(self) -> Optional[str]:
-        return self.image.url
+        return build_image_url(self.image)
 
     class Meta:
         ordering = ["-created"]
@@ -101,6 +115,14 @@ class Review(BaseModel):
         null=True,
         blank=True,
     )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept so a new image can be detected when the review is saved
+        instance._loaded_image = get_public_id(instance.__dict__.get("image"))
+        return instance
 
     def __str__(self):
         return f"{self.customer.user.full_name} review on {self.product.name}"
@@ -33,6 +33,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             "text",
             "rating",
             "image",
+            "image_variants",
             "created",
         ]
 
@@ -89,7 +90,7 @@ class ReviewUpdateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         instance = self.instance
         # Ensure the user can only update their own review
-        if instance and instance.customer != self.context["request"].user.profile:
+        if instance and instance.customer_id != self.context["request"].user.profile.id:
             raise PermissionDenied("You don't have permission to update this review.")
         return attrs
 
@@ -115,11 +116,12 @@ class ProductSerializer(serializers.ModelSerializer):
             "avg_rating",
             "image_url",
             "cropped_image_url",
+            "image_variants",
         ]
 
     @extend_schema_field(serializers.URLField)
     def get_cropped_image_url(self, obj):
-        return obj.get_cropped_image_url()
+        return obj.image_variants.get("cropped") or obj.get_cropped_image_url()
 
 
 class ProductWithReviewsSerializer(serializers.ModelSerializer):
@@ -145,12 +147,13 @@ class ProductWithReviewsSerializer(serializers.ModelSerializer):
             "num_of_reviews",
             "image_url",
             "cropped_image_url",
+            "image_variants",
             "reviews",
         ]
 
     @extend_schema_field(serializers.URLField)
     def get_cropped_image_url(self, obj):
-        return obj.get_cropped_image_url()
+        return obj.image_variants.get("cropped") or obj.get_cropped_image_url()
 
 
 class ProductAddSerializer(serializers.ModelSerializer):
@@ -171,11 +174,12 @@ class ProductAddSerializer(serializers.ModelSerializer):
             "is_available",
             "image_url",
             "cropped_image_url",
+            "image_variants",
         ]
 
     @extend_schema_field(serializers.URLField)
     def get_cropped_image_url(self, obj):
-        return obj.get_cropped_image_url()
+        return obj.image_variants.get("cropped") or obj.get_cropped_image_url()
 
 
 class WishlistSerializer(serializers.ModelSerializer):
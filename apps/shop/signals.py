@@ -1,10 +1,13 @@
 import logging
 
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django.utils import timezone
 
+from apps.common.images import queue_image_variants
 from apps.discount.models import ProductDiscount
-from apps.discount.service import apply_discount_to_product
+from apps.discount.service import apply_discount_to_product, recompute_discounted_prices
+from apps.shop.models import Category, Product, Review
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,44 @@ def handle_product_discount_delete(sender, instance, **kwargs):
     logger.info(f"Discount removed from: {instance.product.name} {instance.discount}")
 
 
+@receiver(post_save, sender=Product)
+def handle_product_price_change(sender, instance, created, **kwargs):
+    """Recompute the discounted price when the base price of a product changes."""
+    if created or getattr(instance, "_loaded_price", None) == instance.price:
+        return
+
+    recompute_discounted_prices(Product.objects.filter(pk=instance.pk))
+    instance.refresh_from_db(fields=["discounted_price"])
+    instance._loaded_price = instance.price
+    logger.info(f"Discounted price recomputed for: {instance.name}")
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Review)
+def handle_image_upload(sender, instance, **kwargs):
+    """Precompute the image variants when a new image is uploaded."""
+    queue_image_variants(instance, "image")
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def touch_reviewed_product(sender, instance, **kwargs):
+    """
+    Bump the product's last_updated so its ETag changes with its reviews
+    and average rating.
+    """
+    Product.objects.filter(pk=instance.product_id).update(last_updated=timezone.now())
+
+
+@receiver(pre_delete, sender=Category)
+def touch_category_products(sender, instance, **kwargs):
+    """
+    The products lose their category through SET_NULL, which doesn't
+    update last_updated, so bump it before the category is deleted.
+    """
+    instance.products.update(last_updated=timezone.now())
+
+
 # @receiver(post_delete, sender=ProductDiscount)
 # def handle_product_discount_delete(sender, instance, **kwargs):
 #     """Reset product's discounted price when ProductDiscount is deleted."""
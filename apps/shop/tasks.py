@@ -1,8 +1,13 @@
 from celery import shared_task
 
+from django.db import transaction
 from django.utils import timezone
 
+from apps.common.locks import single_instance
 from apps.discount.models import Discount, ProductDiscount
+from apps.discount.service import recompute_discounted_prices
+from apps.orders.choices import DiscountChoices
+from apps.shop.models import Product
 
 import logging
 
@@ -10,27 +15,87 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
+@single_instance()
 def check_expired_discounts():
     """
-    Periodic task to check and update expired discount
+    Periodic task to clear the discounted price of products whose discount expired.
+    Each expired discount is processed once and then marked so later runs skip it.
     """
     try:
-        expired_discounts = Discount.objects.filter(end_date__lt=timezone.now())
-        processed_count = 0
-
-        for discount in expired_discounts:
-            try:
-                product_discount = discount.product
-                product = product_discount.product
-                product.discounted_price = None
-                product.save()
-                processed_count += 1
-                logger.info(f"Expired discount removed from {product.name}")
-            except ProductDiscount.DoesNotExist:
-                logger.warning(f"No product discount found for discount {discount.id}")
-                continue
-
-        return f"Processed {expired_discounts.count()} expired discounts"
+        now = timezone.now()
+
+        with transaction.atomic():
+            # Lock the discounts so overlapping runs don't process them twice
+            expired_discount_ids = list(
+                Discount.objects.select_for_update(skip_locked=True)
+                .filter(end_date__lte=now, expired_processed_at__isnull=True)
+                .values_list("id", flat=True)
+            )
+
+            if not expired_discount_ids:
+                return "Processed 0 expired discounts"
+
+            # Single UPDATE ... WHERE id IN (subquery); product signals are not needed here
+            products_count = Product.objects.filter(
+                id__in=ProductDiscount.objects.filter(
+                    discount_id__in=expired_discount_ids
+                ).values("product_id"),
+                discounted_price__isnull=False,
+            ).update(discounted_price=None, last_updated=now)
+
+            discounts_count = Discount.objects.filter(
+                id__in=expired_discount_ids
+            ).update(expired_processed_at=now)
+
+        logger.info(
+            f"Expired {discounts_count} discounts and removed them from {products_count} products"
+        )
+        return f"Processed {discounts_count} expired discounts, reset {products_count} products"
     except Exception as e:
         logger.error(f"Error checking expired discounts: {str(e)}")
         return f"Error: {str(e)}"
+
+
+@shared_task
+@single_instance()
+def activate_scheduled_discounts(batch_size=100):
+    """
+    Periodic task to compute the discounted price of products whose discount
+    has started (or was changed) since the last run, a batch of discounts at a time.
+    Discounts are marked as activated, so running it again does nothing.
+    """
+    try:
+        now = timezone.now()
+        activated_count = 0
+        products_count = 0
+
+        while True:
+            with transaction.atomic():
+                # Lock the batch so overlapping runs don't process it twice
+                discount_ids = list(
+                    Discount.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        start_date__lte=now,
+                        end_date__gt=now,
+                        activated_at__isnull=True,
+                    )
+                    .exclude(discount_type=DiscountChoices.TIERED)
+                    .values_list("id", flat=True)[:batch_size]
+                )
+
+                if not discount_ids:
+                    break
+
+                products_count += recompute_discounted_prices(
+                    Product.objects.filter(product__discount_id__in=discount_ids)
+                )
+                Discount.objects.filter(id__in=discount_ids).update(activated_at=now)
+                activated_count += len(discount_ids)
+
+        logger.info(
+            f"Activated {activated_count} discounts on {products_count} products"
+        )
+        return f"Activated {activated_count} discounts, updated {products_count} products"
+    except Exception as e:
+        logger.error(f"Error activating scheduled discounts: {str(e)}")
+        return f"Error: {str(e)}"
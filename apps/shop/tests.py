@@ -1,9 +1,27 @@
 import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from cloudinary import CloudinaryResource
+from django.core.management import call_command
+from django.utils import timezone
 from rest_framework.test import APITestCase
 
-from apps.common.utils import TestUtil
-
-from apps.shop.models import Wishlist
+from apps.common.images import (
+    IMAGE_VARIANTS,
+    build_image_url,
+    clear_image_url_cache,
+    image_url_cache_info,
+)
+from apps.common.tasks import generate_image_variants
+from apps.common.utils import QueryBudgetMixin, TestUtil
+
+from apps.discount.models import Discount, ProductDiscount
+from apps.discount.service import recompute_discounted_prices
+from apps.shop.models import Product, Review, Wishlist
+from apps.shop.tasks import activate_scheduled_discounts, check_expired_discounts
 from apps.shop.test_utils import TestShopUtil
 
 
@@ -161,6 +179,102 @@ class TestShop(APITestCase):
         response = self.client.get(self.category_list_url)
         self.assertEqual(response.status_code, 200)
 
+    def test_conditional_get(self):
+        response = self.client.get(self.product_detail_url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # Test 304 with only the validator query
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.product_detail_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+
+        # Test 200 after the product changes, including bulk updates
+        check_time = timezone.now()
+        self.product1.description = "Updated description"
+        self.product1.save()
+        response = self.client.get(self.product_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.product1.refresh_from_db()
+        self.assertGreaterEqual(self.product1.last_updated, check_time)
+
+        # Test reviews change the product reviews ETag
+        response = self.client.get(self.product_reviews_url)
+        etag = response["ETag"]
+        self.review.text = "Updated review"
+        self.review.save()
+        response = self.client.get(self.product_reviews_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Test category list
+        response = self.client.get(self.category_list_url)
+        etag = response["ETag"]
+        response = self.client.get(self.category_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            self.category_list_url,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Test 404 is unaffected
+        response = self.client.get(
+            self.nonexistent_product_url, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_image_url_cache(self):
+        clear_image_url_cache()
+        image = CloudinaryResource(
+            public_id="products/test", format="jpg", version="1", type="upload"
+        )
+
+        # Same URL as Cloudinary builds, computed once per transformation
+        self.assertEqual(build_image_url(image), image.url)
+        build_image_url(image)
+        build_image_url(image, width=250, height=250, crop="fill")
+        info = image_url_cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+        out = StringIO()
+        call_command(
+            "benchmark_product_serialization", "--products", "5", "--repeat", "1",
+            stdout=out,
+        )
+        self.assertIn("µs/product", out.getvalue())
+
+    def test_image_variants(self):
+        # Uploading an image queues the variants once the transaction commits
+        product = Product.objects.get(pk=self.product1.pk)
+        product.image = CloudinaryResource(
+            public_id="products/test",
+            format="jpg",
+            version="1",
+            type="upload",
+            resource_type="image",
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+        self.assertEqual(len(callbacks), 1)
+
+        # Saving without a new image queues nothing
+        product = Product.objects.get(pk=self.product1.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            product.save()
+        self.assertEqual(len(callbacks), 0)
+
+        generate_image_variants("shop.Product", str(product.pk), "image")
+        product.refresh_from_db()
+        self.assertEqual(set(product.image_variants), set(IMAGE_VARIANTS))
+
+        response = self.client.get(self.product_detail_url)
+        data = response.data["data"]
+        self.assertEqual(data["image_variants"], product.image_variants)
+        self.assertEqual(data["cropped_image_url"], product.image_variants["cropped"])
+
     def test_category_product_list(self):
         # Test success
         response = self.client.get(self.category1_url)
@@ -231,5 +345,180 @@ class TestShop(APITestCase):
         response = self.client.delete(self.remove_from_wishlist_url)
         self.assertEqual(response.status_code, 401)
 
+    def test_check_expired_discounts(self):
+        discount = Discount.objects.create(
+            name="Test Discount",
+            discount_type="percentage",
+            value=10,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+        ProductDiscount.objects.create(discount=discount, product=self.product1)
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, 900)
+
+        # Test active discount is left alone
+        self.assertEqual(check_expired_discounts(), "Processed 0 expired discounts")
+
+        # Test expired discount removed from product
+        Discount.objects.filter(id=discount.id).update(
+            end_date=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(
+            check_expired_discounts(),
+            "Processed 1 expired discounts, reset 1 products",
+        )
+        self.product1.refresh_from_db()
+        self.assertIsNone(self.product1.discounted_price)
+
+        # Test processed discount is not rescanned
+        self.assertEqual(check_expired_discounts(), "Processed 0 expired discounts")
+
+        # Test extended discount is processed again once it ends
+        discount.refresh_from_db()
+        self.assertIsNotNone(discount.expired_processed_at)
+        discount.end_date = timezone.now() + timedelta(days=1)
+        discount.save()
+        self.assertIsNone(discount.expired_processed_at)
+
+        # Test discount ending exactly now is expired, as is_expired says
+        with patch("django.utils.timezone.now", return_value=discount.end_date):
+            self.assertTrue(discount.is_expired)
+            self.assertEqual(
+                check_expired_discounts(),
+                "Processed 1 expired discounts, reset 0 products",
+            )
+
+    def test_discounted_price_rounding(self):
+        self.product1.price = Decimal("10.25")
+        self.product1.save()
+        discount = Discount.objects.create(
+            name="Half Price",
+            discount_type="percentage",
+            value=50,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+
+        # Test 5.125 rounds half up in Python (per product) and SQL (bulk)
+        ProductDiscount.objects.create(discount=discount, product=self.product1)
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, Decimal("5.13"))
+
+        recompute_discounted_prices(Product.objects.filter(pk=self.product1.pk))
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, Decimal("5.13"))
+
+    def test_activate_scheduled_discounts(self):
+        discount = Discount.objects.create(
+            name="Scheduled Discount",
+            discount_type="percentage",
+            value=10,
+            start_date=timezone.now() + timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=10),
+        )
+
+        # Test discount not applied before it starts
+        ProductDiscount.objects.create(discount=discount, product=self.product1)
+        self.product1.refresh_from_db()
+        self.assertIsNone(self.product1.discounted_price)
+        self.assertEqual(
+            activate_scheduled_discounts(), "Activated 0 discounts, updated 0 products"
+        )
+
+        # Test discount applied once it starts
+        Discount.objects.filter(id=discount.id).update(
+            start_date=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(
+            activate_scheduled_discounts(), "Activated 1 discounts, updated 1 products"
+        )
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, 900)
+
+        # Test running again does nothing
+        self.assertEqual(
+            activate_scheduled_discounts(), "Activated 0 discounts, updated 0 products"
+        )
+
+        # Test price change recomputes the discounted price
+        self.product1.price = 2000
+        self.product1.save()
+        self.assertEqual(self.product1.discounted_price, 1800)
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.discounted_price, 1800)
+
 
 # python manage.py test apps.shop.tests.TestShop.test_product_list
+
+
+class TestShopQueryBudgets(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        self.user1 = TestUtil.verified_user()
+        self.user2 = TestUtil.other_verified_user()
+        self.product1, self.product2, self.product3 = TestShopUtil.product(self.user1)
+        TestShopUtil.order_item_for_review(self.product1, self.user1.profile)
+
+        # Enough rows that a relation read per row shows up as repeated queries
+        for index in range(3):
+            product = Product.objects.create(
+                name=f"Budget Product {index}",
+                description="Budget product",
+                price=500,
+                in_stock=5,
+                category=self.product1.category,
+                image="",
+            )
+            Review.objects.create(
+                product=product, customer=self.user2.profile, text="Good", rating=5
+            )
+        Review.objects.create(
+            product=self.product3, customer=self.user2.profile, text="Nice", rating=4
+        )
+        self.review = Review.objects.get(
+            product=self.product3, customer=self.user1.profile
+        )
+
+        wishlist, _ = Wishlist.objects.get_or_create(profile=self.user1.profile)
+        wishlist.products.add(*Product.objects.exclude(id=self.product1.id))
+
+        self.client.force_authenticate(user=self.user1)
+
+    def test_catalog_budgets(self):
+        product_url = f"/api/v1/products/{self.product3.pk}/{self.product3.slug}/"
+        category_url = f"/api/v1/categories/{self.product1.category.slug}/products/"
+
+        self.assertQueryBudget(3, "get", "/api/v1/products/")
+        self.assertQueryBudget(3, "get", product_url)
+        self.assertQueryBudget(4, "get", f"{product_url}reviews/")
+        self.assertQueryBudget(3, "get", "/api/v1/categories/")
+        self.assertQueryBudget(3, "get", category_url)
+
+    def test_review_budgets(self):
+        response = self.assertQueryBudget(
+            5,
+            "post",
+            "/api/v1/reviews/create/",
+            {"product": self.product1.id, "text": "Great", "rating": 5},
+        )
+        self.assertEqual(response.status_code, 201)
+
+        url = f"/api/v1/reviews/{self.review.pk}/"
+        self.assertQueryBudget(3, "patch", url, {"text": "Updated"})
+        response = self.assertQueryBudget(3, "delete", url)
+        self.assertEqual(response.status_code, 204)
+
+    def test_wishlist_budgets(self):
+        self.assertQueryBudget(3, "get", "/api/v1/wishlist/")
+        self.assertQueryBudget(4, "post", f"/api/v1/wishlist/{self.product1.id}/")
+        self.assertQueryBudget(4, "delete", f"/api/v1/wishlist/{self.product3.id}/")
+
+    def test_admin_changelist_budgets(self):
+        self.user1.is_staff = self.user1.is_superuser = True
+        self.user1.save()
+        self.client.force_login(self.user1)
+
+        # Row labels read the customer's user, which must be joined in
+        for budget, url in ((6, "/admin/shop/review/"), (8, "/admin/shop/wishlist/")):
+            response = self.assertQueryBudget(budget, "get", url)
+            self.assertEqual(response.status_code, 200)
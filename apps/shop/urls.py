@@ -6,11 +6,11 @@ urlpatterns = [
     path("products/", views.ProductListGenericView.as_view()),
     path(
         "products/<uuid:pk>/<slug:slug>/",
-        views.ProductRetrieveView.as_view(),
+        views.ProductRetrieveGenericView.as_view(),
     ),
     path(
         "products/<uuid:pk>/<slug:slug>/reviews/",
-        views.ProductReviewsRetrieveView.as_view(),
+        views.ProductReviewsRetrieveGenericView.as_view(),
     ),
     path("reviews/create/", views.ReviewCreateView.as_view()),
     path("reviews/<uuid:pk>/", views.ReviewUpdateDestroyView.as_view()),
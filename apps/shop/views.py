@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -9,6 +10,7 @@ from rest_framework.views import APIView
 
 from apps.common.errors import ErrorCode
 from apps.common.exceptions import NotFoundError
+from apps.common.mixins import ConditionalGetMixin
 from apps.common.pagination import CustomPagination, DefaultPagination
 from apps.common.responses import CustomResponse
 from apps.shop.filters import ProductFilter
@@ -252,7 +254,7 @@ class WishlistUpdateDestroyView(APIView):
                 err_msg="Product not found.",
             )
 
-        if product in wishlist.products.all():
+        if wishlist.products.filter(id=product.id).exists():
             return CustomResponse.error(
                 message="Product already in wishlist.",
                 status_code=status.HTTP_409_CONFLICT,
@@ -279,7 +281,7 @@ class WishlistUpdateDestroyView(APIView):
                 err_msg="Product not found.",
             )
 
-        if product not in wishlist.products.all():
+        if not wishlist.products.filter(id=product.id).exists():
             return CustomResponse.error(
                 message="Product not in wishlist.",
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -371,7 +373,7 @@ class ReviewUpdateDestroyView(APIView):
         """
         review = self.get_object(pk)
 
-        if review.customer != self.request.user:
+        if review.customer_id != self.request.user.profile.id:
             return CustomResponse.error(
                 message="You don't have permission to delete this review.",
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -385,7 +387,7 @@ class ReviewUpdateDestroyView(APIView):
 
 
 # Generic version
-class CategoryListGenericView(ListAPIView):
+class CategoryListGenericView(ConditionalGetMixin, ListAPIView):
     """
     View to list all categories using ListAPIView.
     """
@@ -518,11 +520,13 @@ class ProductListGenericView(ListAPIView):
         )
 
 
-class ProductRetrieveGenericView(RetrieveAPIView):
+class ProductRetrieveGenericView(ConditionalGetMixin, RetrieveAPIView):
     serializer_class = ProductSerializer
     queryset = Product.objects.select_related("category").filter(
         in_stock__gt=0, is_available=True
     )
+    # Reviews touch the product's timestamp, which covers avg_rating
+    last_modified_fields = ["last_updated", "category__last_updated"]
 
     @extend_schema(
         summary="Retrieve a specific product by ID and slug",
@@ -537,12 +541,18 @@ class ProductRetrieveGenericView(RetrieveAPIView):
         """
         return super().get(request, *args, **kwargs)
 
+    def get_validator_queryset(self):
+        lookup_url_kwargs = self.lookup_url_kwarg or self.lookup_field
+        return Product.objects.available().filter(
+            id=self.kwargs.get(lookup_url_kwargs), slug=self.kwargs.get("slug")
+        )
+
     def get_object(self):
         """
         Retrieve the product instance using both `pk` and `slug`.
         """
         queryset = self.filter_queryset(self.get_queryset())
-        lookup_url_kwargs = self.lookup_url_kwargs or self.lookup_field
+        lookup_url_kwargs = self.lookup_url_kwarg or self.lookup_field
 
         # Extract `pk` and `slug` from the URL kwargs
         pk = self.kwargs.get(lookup_url_kwargs)
@@ -564,19 +574,21 @@ class ProductRetrieveGenericView(RetrieveAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return CustomResponse.success(
-            message="Product retrieved successfully",
+            message="Product retrieved successfully.",
             data=serializer.data,
             status_code=status.HTTP_200_OK,
         )
 
 
-class ProductReviewsRetrieveGenericView(RetrieveAPIView):
+class ProductReviewsRetrieveGenericView(ConditionalGetMixin, RetrieveAPIView):
     serializer_class = ProductWithReviewsSerializer
     queryset = (
         Product.objects.select_related("category")
         .prefetch_related("reviews", "reviews__customer")
         .filter(in_stock__gt=0, is_available=True)
     )
+    # Reviews touch the product's timestamp when they change
+    last_modified_fields = ["last_updated", "category__last_updated"]
 
     @extend_schema(
         summary="Retrieve a specific product by ID and slug with reviews",
@@ -591,12 +603,18 @@ class ProductReviewsRetrieveGenericView(RetrieveAPIView):
         """
         return super().get(request, *args, **kwargs)
 
+    def get_validator_queryset(self):
+        lookup_url_kwargs = self.lookup_url_kwarg or self.lookup_field
+        return Product.objects.available().filter(
+            id=self.kwargs.get(lookup_url_kwargs), slug=self.kwargs.get("slug")
+        )
+
     def get_object(self):
         """
         Retrieve the product instance using both `pk` and `slug`.
         """
         queryset = self.filter_queryset(self.get_queryset())
-        lookup_url_kwargs = self.lookup_url_kwargs or self.lookup_field
+        lookup_url_kwargs = self.lookup_url_kwarg or self.lookup_field
 
         # Extract `pk` and `slug` from the URL kwargs
         pk = self.kwargs.get(lookup_url_kwargs)
@@ -633,7 +651,13 @@ class WishlistGenericView(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        wishlist, _ = Wishlist.objects.get_or_create(profile=self.request.user.profile)
+        # Products are serialized with their category and rating, load them together
+        products = Product.objects.select_related("category").prefetch_related(
+            "reviews"
+        )
+        wishlist, _ = Wishlist.objects.prefetch_related(
+            Prefetch("products", queryset=products)
+        ).get_or_create(profile=self.request.user.profile)
         return wishlist
 
     @extend_schema(
@@ -47,7 +47,6 @@ THIRD_PARTY_APPS = [
     "rest_framework_simplejwt.token_blacklist",
     "cloudinary_storage",
     "cloudinary",
-    "debug_toolbar",
     "drf_spectacular",
     "django_filters",
     "corsheaders",
@@ -68,12 +67,11 @@ LOCAL_APPS = [
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
-INTERNAL_IPS = [
-    "127.0.0.1",
-]
-
 MIDDLEWARE = [
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    # Outermost, so latency covers every other middleware
+    "apps.common.middleware.MetricsMiddleware",
+    "apps.common.middleware.ProfilerMiddleware",
+    "apps.common.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -85,6 +83,11 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Responses smaller than this aren't compressed, the saving doesn't pay for the CPU
+COMPRESSION_MIN_SIZE = 860
+# Brotli quality (0-11) and gzip level (1-9); higher saves bytes at more CPU per request
+COMPRESSION_LEVELS = {"br": 4, "gzip": 6}
+
 ROOT_URLCONF = "clothing_store.urls"
 
 TEMPLATES = [
@@ -198,15 +201,48 @@ DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
 
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Each queue gets its own worker (see deployment/celery) so a slow invoice render
+# can't hold up payment processing or emails. Unrouted tasks go to "default".
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "apps.payments.tasks.process_successful_payment": {"queue": "payments"},
+    "apps.payments.tasks.payment_successful": {"queue": "invoices"},
+    "apps.payments.tasks.order_pending_cancellation": {"queue": "emails"},
+    "apps.orders.tasks.order_created": {"queue": "emails"},
+    "apps.orders.tasks.cancel_expired_orders": {"queue": "maintenance"},
+    "apps.orders.tasks.delete_expired_orders": {"queue": "maintenance"},
+    "apps.orders.tasks.check_pending_orders": {"queue": "maintenance"},
+    "apps.shop.tasks.*": {"queue": "maintenance"},
+    "apps.profiles.tasks.*": {"queue": "maintenance"},
+    "apps.accounts.tasks.purge_expired_tokens_task": {"queue": "maintenance"},
+}
+
+# Acknowledge after the task runs, so a task lost with its worker is redelivered,
+# and only reserve one task at a time so long tasks don't hoard the queue
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Redis redelivers unacknowledged tasks after this long, keep it above the longest task
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 60 * 60}
+
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "apps.common.throttling.SlidingWindowAnonRateThrottle",
+        "apps.common.throttling.SlidingWindowUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/day",
@@ -215,6 +251,26 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "apps.common.exceptions.custom_exception_handler",
 }
 
+TEST_RUNNER = "apps.common.test_runner.CacheClearingTestRunner"
+
+# Queries of one shape run this many times in a request are reported as an N+1
+# by NPlusOneMiddleware (development) and QueryBudgetMixin (tests)
+N_PLUS_ONE_THRESHOLD = 3
+
+# Bearer token required to scrape /metrics. Empty allows any client, which
+# only development does; prod.py refuses to start without a token
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Share of requests profiled without an X-Profile header, e.g. 0.01 for 1%
+PROFILER_SAMPLE_RATE = config("PROFILER_SAMPLE_RATE", default=0.0, cast=float)
+# Seconds between stack samples; shorter catches more detail at more overhead
+PROFILER_INTERVAL = 0.005
+# How long a token from `manage.py profile_token` is accepted, in seconds
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+PROFILER_DIR = config("PROFILER_DIR", default=os.path.join(BASE_DIR, "request_profiles"))
+# Profiles kept per view; the oldest are deleted as new ones are saved
+PROFILER_MAX_FILES = config("PROFILER_MAX_FILES", default=200, cast=int)
+
 SUPERUSER_EMAIL = config("SUPERUSER_EMAIL")
 SUPERUSER_PASSWORD = config("SUPERUSER_PASSWORD")
 STORE_MANAGER_EMAIL = config("STORE_MANAGER_EMAIL")
@@ -238,6 +294,10 @@ SPECTACULAR_SETTINGS = {
 
 
 EMAIL_OTP_EXPIRE_MINUTES = 15
+# DatabaseOtpStore is the fallback backend used by the test suite
+OTP_STORE = "apps.accounts.otp.RedisOtpStore"
+OTP_MAX_ATTEMPTS = 5
+OTP_RESEND_INTERVAL_SECONDS = 60
 
 FIRST_PURCHASE_DISCOUNT = 10
 
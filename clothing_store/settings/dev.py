@@ -12,6 +12,21 @@ DEBUG = True
 # ALLOWED_HOSTS = config("ALLOWED_HOSTS").split(" ")
 ALLOWED_HOSTS = ["*"]
 
+INSTALLED_APPS += ["debug_toolbar"]
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
+# After compression, the toolbar has to see the uncompressed body
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("apps.common.middleware.CompressionMiddleware") + 1,
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+)
+
+# Log repeated query shapes per request, see N_PLUS_ONE_THRESHOLD
+MIDDLEWARE += ["apps.common.middleware.NPlusOneMiddleware"]
+
 CSRF_TRUSTED_ORIGINS = ["https://*.ngrok.io", "https://*.ngrok-free.app"]
 
 CORS_ALLOWED_ORIGINS = [
@@ -52,11 +67,31 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.shop.tasks.check_expired_discounts",
         "schedule": 60 * 5,  # Run every 5 minutes
     },
+    "activate-scheduled-discounts": {
+        "task": "apps.shop.tasks.activate_scheduled_discounts",
+        "schedule": 60 * 5,  # Run every 5 minutes
+    },
+    "purge-expired-tokens": {
+        "task": "apps.accounts.tasks.purge_expired_tokens_task",
+        "schedule": crontab(hour=0, minute=30),  # Every day at 12:30 AM
+    },
 }
 
 # set default cos of CI 
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://127.0.0.1:6379/1")
 REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+CACHE_URL = config("CACHE_URL", default="redis://localhost:6379/2")
+
+# Separate database from the cart (REDIS_URL) and the broker, so it can be flushed
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+    }
+}
+# Sessions are written to the database and read through the cache, so flushing
+# or evicting the cache doesn't log out admins or drop guest carts
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
 # if DEBUG:
 #     hide_toolbar_patterns = ["/media/", "/static/"]
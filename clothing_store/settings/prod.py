@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 DEBUG = False
@@ -34,7 +36,24 @@ if DATABASE_URL:
         )
 
 CELERY_BROKER_URL = config("CELERY_BROKER_URL")
+
+# /metrics exposes view latencies and Redis and Celery internals
+METRICS_TOKEN = config("METRICS_TOKEN")
+if not METRICS_TOKEN:
+    raise ImproperlyConfigured("METRICS_TOKEN must be set in production.")
 REDIS_URL = config("REDIS_URL")
+CACHE_URL = config("CACHE_URL")
+
+# Separate database from the cart (REDIS_URL) and the broker, so it can be flushed
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+    }
+}
+# Sessions are written to the database and read through the cache, so flushing
+# or evicting the cache doesn't log out admins or drop guest carts
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
 CELERY_BEAT_SCHEDULE = {
     "cancel-expired-orders": {
@@ -47,7 +66,15 @@ CELERY_BEAT_SCHEDULE = {
     },
     "check-expired-discounts": {
         "task": "apps.shop.tasks.check_expired_discounts",
-        "schedule": crontab(hour=1, minute=0),  # Once daily at 1 AM
+        "schedule": 60 * 5,  # Every 5 minutes so discounts end on time, no-op when nothing expired
+    },
+    "activate-scheduled-discounts": {
+        "task": "apps.shop.tasks.activate_scheduled_discounts",
+        "schedule": 60 * 5,  # Every 5 minutes so discounts start on time
+    },
+    "purge-expired-tokens": {
+        "task": "apps.accounts.tasks.purge_expired_tokens_task",
+        "schedule": crontab(hour=3, minute=0),  # Once daily at 3 AM
     },
 }
 
@@ -14,6 +14,7 @@ from rest_framework.views import APIView
 
 from apps.common.responses import CustomResponse
 from apps.common.serializers import SuccessResponseSerializer
+from apps.common.views import metrics
 
 
 class HealthCheckView(APIView):
@@ -80,6 +81,7 @@ urlpatterns = [
         name="redoc",
     ),
     path("api/v1/healthcheck/", HealthCheckView.as_view()),
+    path("metrics", metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
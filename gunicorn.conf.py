@@ -0,0 +1,8 @@
+# Loaded by gunicorn from the working directory (see deployment/docker-run)
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live samples from the shared metrics directory
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)